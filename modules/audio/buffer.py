@@ -0,0 +1,126 @@
+from threading import Condition
+
+
+class RingBuffer():
+    def __init__(self, capacity: int) -> None:
+        """
+        Creates a fixed-capacity byte ring buffer, used to hand audio between
+        the PortAudio callback thread and the socket loops.
+
+        ---
+        Arguments
+        ---
+
+            capacity (int)
+        The buffer capacity, in bytes.
+        """
+
+        # The backing storage, allocated once.
+        self.__buffer = bytearray(capacity)
+
+        # The buffer capacity, in bytes.
+        self.__capacity = capacity
+
+        # Offset of the oldest byte.
+        self.__start = 0
+
+        # Number of buffered bytes.
+        self.__size = 0
+
+        # Signals readers when new data arrives.
+        self.__available = Condition()
+
+    def read(self, size: int, block: bool = True) -> bytes:
+        """
+        Reads bytes from this buffer.
+
+        ---
+        Arguments
+        ---
+
+            size (int)
+        A number of bytes to read.
+
+            block (bool, True)
+        Sets whether the call should wait until `size` bytes are buffered.
+        When False, only the bytes already buffered are returned, which may
+        be fewer than requested. The audio callback must never block.
+
+        ---
+        Returns
+        ---
+
+            bytes
+        The read bytes.
+        """
+
+        with self.__available:
+
+            # If the call should block,...
+            if block:
+
+                # ... waits until enough bytes are buffered.
+                self.__available.wait_for(lambda: self.__size >= size)
+
+            # Never reads more than what is buffered.
+            size = min(size, self.__size)
+
+            # The contiguous span until the end of the storage.
+            first = min(size, self.__capacity - self.__start)
+
+            # Copies the bytes out, wrapping around if needed.
+            data = self.__buffer[self.__start:self.__start + first] + \
+                self.__buffer[:size - first]
+
+            # Advances the read offset.
+            self.__start = (self.__start + size) % self.__capacity
+
+            # Shrinks the buffered byte count.
+            self.__size -= size
+
+            # Returns the read bytes.
+            return bytes(data)
+
+    def write(self, data: bytes) -> None:
+        """
+        Writes bytes into this buffer. When the buffer is full, the oldest
+        bytes are dropped, so the writer never blocks.
+
+        ---
+        Arguments
+        ---
+
+            data (bytes)
+        The bytes to write. Any bytes-like object is accepted.
+        """
+
+        with self.__available:
+
+            # The number of bytes to write.
+            size = len(data)
+
+            # The number of bytes that would not fit.
+            overflow = self.__size + size - self.__capacity
+
+            # If the buffer would overflow,...
+            if overflow > 0:
+
+                # ... drops the oldest bytes.
+                self.__start = (self.__start + overflow) % self.__capacity
+                self.__size -= overflow
+
+            # Offset of the first free byte.
+            end = (self.__start + self.__size) % self.__capacity
+
+            # The contiguous span until the end of the storage.
+            first = min(size, self.__capacity - end)
+
+            # Copies the bytes in, wrapping around if needed.
+            self.__buffer[end:end + first] = data[:first]
+            self.__buffer[:size - first] = data[first:]
+
+            # Grows the buffered byte count.
+            self.__size += size
+
+            # Wakes up the readers.
+            self.__available.notify_all()
@@ -9,8 +9,23 @@ from modules.socket.settings import PACKAGE_SIZE
 # Number of sound channels.
 CHANNELS = 2
 
+# The sample data type of the streams, materialized once instead of being
+# rebuilt at every call site.
+SAMPLE_DTYPE = np.dtype(np.int16)
+
+# The size of a single sample, in bytes.
+SAMPLE_ITEMSIZE = SAMPLE_DTYPE.itemsize
+
 # The size of the streaming buffer, that needs to fit into the socket buffer.
-CHUNK_SIZE = PACKAGE_SIZE // CHANNELS // np.dtype(np.int16).itemsize
+CHUNK_SIZE = PACKAGE_SIZE // CHANNELS // SAMPLE_ITEMSIZE
+
+# The size of a whole audio frame, in bytes.
+FRAME_BYTES = CHUNK_SIZE * CHANNELS * SAMPLE_ITEMSIZE
 
 # Sound device frame rate. In this case, 44.1 KHz.
 FRAME_RATE = int(44.1e3)
+
+# Number of chunks held by the ring buffers between the socket loops and the
+# audio callbacks. Enough to absorb network jitter, small enough to keep the
+# added latency well below a tenth of a second.
+JITTER_CHUNKS = 8
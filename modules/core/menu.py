@@ -1,4 +1,6 @@
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+
+from threading import Event, Thread
 
 from modules.core.options import connect, set_name
 
@@ -15,9 +17,9 @@ from modules.socket.error import (InvalidPortError, PortAlreadyUsedError,
 
 from modules.socket.server import Server
 
-from modules.socket.settings import DEFAULT_PORT
+from modules.socket.settings import DEFAULT_PORT, MAX_CLIENTS
 
-from modules.utils.utils import (_l, _lt, _ltb, ellipsis, error, label,
+from modules.utils.utils import (_l, _lt, _ltb, ellipsis, error, label, menu,
                                  press_enter_to, success, title)
 
 
@@ -41,15 +43,13 @@ def client_option() -> None:
                     client.get_name())))))
             print(_ltb('What do you want to do?'))
 
-            # Sets the client menu options, with their respective methods.
-            options = [['Connect to a server', 'connect'],
-                       ['Change my name', 'set_name']]
-
-            # Lists the options.
-            for i, option in enumerate(options):
-                print(_l(label(option[0], F().red(i + 1), F())))
+            # Sets the client menu options, with their respective functions.
+            options = [['Connect to a server', connect],
+                       ['Change my name', set_name]]
 
-            print(_l(label('Quit to main menu', F().red(0), F())))
+            # Lists the options, rendered once and cached across redraws.
+            print(menu([option[0] for option in options],
+                       'Quit to main menu'))
 
             # Reads the chosen option.
             try:
@@ -72,8 +72,8 @@ def client_option() -> None:
 
             try:
 
-                # If no, runs the corresponding function.
-                globals()[options[opt - 1][1]](client)
+                # If no, runs the corresponding function directly.
+                options[opt - 1][1](client)
 
             # Ctrl+C pressed.
             except (EOFError, KeyboardInterrupt):
@@ -108,9 +108,13 @@ def server_option() -> None:
 
                 print()
 
+                # The event that stops the feedback animation.
+                stop = Event()
+
                 # Sets the feedback animation thread...
                 thread = Thread(target=ellipsis,
                                 args=(_l('Starting'), F().yellow()),
+                                kwargs={'stop': stop},
                                 daemon=True)
 
                 # ... and starts it.
@@ -125,7 +129,7 @@ def server_option() -> None:
                 except (EOFError, KeyboardInterrupt):
 
                     # Stops the feedback animation thread.
-                    thread.alive = False
+                    stop.set()
 
                     print(_lt(_lt(error('Operation canceled by the user!'))))
                     press_enter_to('try again', F().red(), F().white())
@@ -133,7 +137,7 @@ def server_option() -> None:
                     continue
 
                 # Stops the feedback animation thread when the connection is established.
-                thread.alive = False
+                stop.set()
 
                 print(_lt(_lt(success('Server started successfully!'))))
                 press_enter_to('continue', F().green(), F().white())
@@ -153,7 +157,7 @@ def server_option() -> None:
                 err = 'The port number must be between 0 and 65535!'
 
             # Stops the feedback animation thread.
-            thread.alive = False
+            stop.set()
 
             print(_lt(_lt(error(err))))
             press_enter_to('try again', F().red(), F().white())
@@ -173,6 +177,12 @@ def server_option() -> None:
         server.log(_lt(label(F().cyan('Recording audio through microphone'))))
         server.log(_lt(label(F().bold().blue('Press Ctrl+C to shutdown'))))
 
+        # Creates the pool of worker threads that handle the clients once,
+        # which bounds the concurrent clients and spares a thread creation
+        # per connection.
+        pool = ThreadPoolExecutor(max_workers=MAX_CLIENTS,
+                                  thread_name_prefix='client')
+
         try:
 
             # Runs this until Ctrl+C is pressed.
@@ -181,13 +191,8 @@ def server_option() -> None:
                 # Accepts a new client.
                 client = server.hello()
 
-                # Starts the thread that handles this client.
-                Thread(target=handle_client,
-                       args=(
-                           server,
-                           client,
-                       ),
-                       daemon=True).start()
+                # Hands this client to a pooled worker thread.
+                pool.submit(handle_client, server, client)
 
         # Ctrl+C pressed.
         except (EOFError, KeyboardInterrupt):
@@ -196,6 +201,9 @@ def server_option() -> None:
             # Shutdowns the server.
             server.disconnect()
 
+            # Shutdowns the worker pool, without waiting for the workers.
+            pool.shutdown(wait=False)
+
             press_enter_to('back to main menu', F().red(), F().white())
 
     # Ctrl+C pressed.
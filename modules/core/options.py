@@ -1,10 +1,11 @@
-from threading import Thread
-
-import numpy as np
+from threading import Event, Thread
 
 import sounddevice as sd
 
-from modules.audio.settings import CHANNELS, CHUNK_SIZE, FRAME_RATE
+from modules.audio.buffer import RingBuffer
+
+from modules.audio.settings import (CHANNELS, CHUNK_SIZE, FRAME_BYTES,
+                                    FRAME_RATE, JITTER_CHUNKS, SAMPLE_DTYPE)
 
 from modules.formatter.formatter import Formatter as F
 
@@ -19,7 +20,7 @@ from modules.socket.error import (ConnectionTimeoutError, InvalidNameError,
 
 from modules.socket.settings import DEFAULT_HOST, DEFAULT_PORT
 
-from modules.utils.utils import (_l, _lt, _ltb, ellipsis, error, label,
+from modules.utils.utils import (_l, _lt, _ltb, ellipsis, error, label, menu,
                                  press_enter_to, success, title)
 
 
@@ -35,28 +36,28 @@ def connect(client: Client) -> None:
     The client instance which wants to connect to a server.
     """
 
+    # Sets the available modulation types, formatted once instead of at
+    # every redraw.
+    options = [
+        [
+            '{} - {}'.format(F().bold('AM'),
+                             F().italic('Amplitude Modulation')), AM
+        ],
+        [
+            '{} - {}'.format(
+                F().bold('AM-SC'),
+                F().italic(
+                    'Amplitude Modulation with Suppressed Carrier')), AM_SC
+        ], [F().italic('No modulation'), NO_MOD]
+    ]
+
     # Asks the user for the modulation type until it is valid.
     while True:
         print(F().magenta(title()))
         print(_l(F().magenta('Choose a modulation type.\n')))
 
-        # Sets the available modulation types.
-        options = [
-            [
-                '{} - {}'.format(F().bold('AM'),
-                                 F().italic('Amplitude Modulation')), AM
-            ],
-            [
-                '{} - {}'.format(
-                    F().bold('AM-SC'),
-                    F().italic(
-                        'Amplitude Modulation with Suppressed Carrier')), AM_SC
-            ], [F().italic('No modulation'), NO_MOD]
-        ]
-
-        # Lists the options.
-        for i, option in enumerate(options):
-            print(_l(label(option[0], F().red(i + 1), F())))
+        # Lists the options, rendered once and cached across redraws.
+        print(menu([option[0] for option in options]))
 
         # Reads the chosen option.
         try:
@@ -102,9 +103,13 @@ def connect(client: Client) -> None:
 
             print()
 
+            # The event that stops the feedback animation.
+            stop = Event()
+
             # Sets the feedback animation thread...
             thread = Thread(target=ellipsis,
                             args=(_l('Connecting'), F().yellow()),
+                            kwargs={'stop': stop},
                             daemon=True)
 
             # ... and starts it.
@@ -119,7 +124,7 @@ def connect(client: Client) -> None:
             except (EOFError, KeyboardInterrupt):
 
                 # Stops the feedback animation thread.
-                thread.alive = False
+                stop.set()
 
                 print(_lt(_lt(error('Operation canceled by the user!'))))
                 press_enter_to('try again', F().red(), F().white())
@@ -127,7 +132,7 @@ def connect(client: Client) -> None:
                 continue
 
             # Stops the feedback animation thread when the connection is established.
-            thread.alive = False
+            stop.set()
 
             print(_lt(_lt(success('Connection established!'))))
             press_enter_to('continue', F().green(), F().white())
@@ -154,53 +159,82 @@ def connect(client: Client) -> None:
             err = 'Unknown host!'
 
         # Stops the feedback animation thread.
-        thread.alive = False
+        stop.set()
 
         print(_lt(_lt(error(err))))
         press_enter_to('try again', F().red(), F().white())
 
-    # Receives some informations and instructions from the server.
-    client.log(client.recv_str())
+    # Receives some informations and instructions from the server, sent by
+    # it as a single package.
     client.log(client.recv_str())
 
-    # Opens a new speaker.
-    with sd.OutputStream(blocksize=CHUNK_SIZE,
-                         channels=CHANNELS,
-                         dtype=np.int16,
-                         samplerate=FRAME_RATE) as speaker:
+    # If the audio is coming modulated,...
+    if modulation != NO_MOD:
+
+        # ... creates the modulation processor once, to be reused across
+        # frames,...
+        processor = M(modulation)
+
+        # ... and the reusable buffer in which every frame is encoded
+        # before being handed to the ring, so the loop below does not
+        # allocate per frame.
+        out = bytearray(FRAME_BYTES)
+
+    # The ring buffer that hands demodulated audio from the socket loop to
+    # the PortAudio callback thread, so network jitter cannot block playback.
+    ring = RingBuffer(FRAME_BYTES * JITTER_CHUNKS)
+
+    def play(outdata, frames, time, status) -> None:
+        """
+        PortAudio playback callback. It must never block, so it pops only
+        the bytes already buffered and pads the rest with silence.
+        """
+
+        # Pops the buffered audio, without blocking.
+        data = ring.read(len(outdata), block=False)
+
+        # Plays it, padding with silence whatever the network missed.
+        outdata[:len(data)] = data
+        outdata[len(data):] = bytes(len(outdata) - len(data))
+
+    # Opens a new speaker in callback mode, which decouples the playback
+    # from the socket loop below.
+    with sd.RawOutputStream(blocksize=CHUNK_SIZE,
+                            callback=play,
+                            channels=CHANNELS,
+                            dtype=SAMPLE_DTYPE.name,
+                            samplerate=FRAME_RATE):
         try:
 
-            # Receives the first package.
-            package = client.recv()
-
-            # Wait for new packages from the server while they are not empty.
-            while len(package) != 0:
-
-                # Gets the audio from the package.
-                received = M(modulation, package)
-
-                # If the client chosen no modulated audio,...
-                if modulation == NO_MOD:
+            # Receives the first package into the client reusable buffer.
+            package = client.recv_into()
 
-                    # ... then just speaks the original package...
-                    speaker.write(received.output())
+            # If the client chosen no modulated audio, just buffers the
+            # packages as they come, while they are not empty. The modulator
+            # is bypassed entirely: nothing about the audio changes, so each
+            # package goes from the socket straight to the ring buffer.
+            if modulation == NO_MOD:
+                while len(package) != 0:
 
-                    # ... and receives the next one.
-                    package = client.recv()
+                    # Buffers the original package for playback.
+                    ring.write(package)
 
-                    continue
+                    # Receives the next package.
+                    package = client.recv_into()
 
-                # Demodulates the received audio.
-                demodulated = received.demodulate()
+            # If no, demodulates the packages while they are not empty.
+            else:
+                while len(package) != 0:
 
-                # Filters the demodulated audio.
-                filtered = demodulated.lowpass()
+                    # Gets the audio from the package.
+                    received = processor.reset(package)
 
-                # Outputs the filtered audio in the speaker.
-                speaker.write(filtered.output())
+                    # Demodulates and filters the received audio in a single
+                    # fused pass, then buffers it for playback.
+                    ring.write(received.demodulate_lowpass().encode(out))
 
-                # Receives the next package.
-                package = client.recv()
+                    # Receives the next package.
+                    package = client.recv_into()
 
             # Logs the server shutdown.
             client.log(_ltb(label(error('The server has been shut down!'))))
@@ -1,14 +1,15 @@
 from socket import socket
 
-import numpy as np
-
 import sounddevice as sd
 
-from modules.audio.settings import CHANNELS, CHUNK_SIZE, FRAME_RATE
+from modules.audio.buffer import RingBuffer
+
+from modules.audio.settings import (CHANNELS, CHUNK_SIZE, FRAME_BYTES,
+                                    FRAME_RATE, JITTER_CHUNKS, SAMPLE_DTYPE)
 
 from modules.formatter.formatter import Formatter as F
 
-from modules.modulator.constants import NO_MOD
+from modules.modulator.constants import MOD_NEEDS_LPF, NO_MOD
 
 from modules.modulator.modulator import Modulator as M
 
@@ -64,67 +65,95 @@ def handle_client(server: Server, client: socket) -> None:
                 nick, ' in {}'.format(modulation.upper())
                 if modulation != NO_MOD else '', host, port)))))
 
-    # Sends some informations and instructions to the client.
-    server.send_str(client,
-                    F().paint(color, title(clear_screen=False)).render())
-    server.send_str(
-        client,
-        _lt(label(F().bold().green('Welcome to PyRadio, {}!'.format(nick)))))
-    server.send_str(
-        client, _lt(F().cyan(label('Your address is {}:{}'.format(host,
-                                                                  port)))))
+    # Sends some informations and instructions to the client, concatenated
+    # into a single package so the whole banner costs one syscall instead of
+    # five.
     server.send_str(
         client,
-        _lt(F().cyan(
-            label('Listening {} modulation'.format('in {}'.format(
-                modulation.upper()) if modulation != NO_MOD else 'without')))))
-    server.send_str(
-        client,
-        _lt(label(F().bold().blue('You can press Ctrl+C to disconnect'))))
-
-    # Opens the microphone.
-    with sd.InputStream(blocksize=CHUNK_SIZE,
-                        channels=CHANNELS,
-                        dtype=np.int16,
-                        samplerate=FRAME_RATE) as microphone:
+        F().paint(color, title(clear_screen=False)).render() + str(
+            _lt(label(F().bold().green('Welcome to PyRadio, {}!'.format(
+                nick))))) +
+        str(_lt(F().cyan(label('Your address is {}:{}'.format(host,
+                                                              port))))) +
+        str(
+            _lt(F().cyan(
+                label('Listening {} modulation'.format(
+                    'in {}'.format(modulation.upper())
+                    if modulation != NO_MOD else 'without'))))) +
+        str(_lt(label(F().bold().blue(
+            'You can press Ctrl+C to disconnect')))))
+
+    # If the audio is going to be modulated,...
+    if modulation != NO_MOD:
+
+        # ... creates the modulation processor once, to be reused across
+        # frames,...
+        processor = M(modulation)
+
+        # ... and the reusable send buffer, in which every frame is encoded
+        # so the loops below do not allocate a fresh bytes object per frame.
+        out = bytearray(FRAME_BYTES)
+
+    # The ring buffer that hands captured audio from the PortAudio callback
+    # thread to the socket loop, so a network stall cannot glitch capture.
+    ring = RingBuffer(FRAME_BYTES * JITTER_CHUNKS)
+
+    def record(indata, frames, time, status) -> None:
+        """
+        PortAudio capture callback. It must never block, so it only copies
+        the captured frame into the ring buffer.
+        """
+
+        # Buffers the captured frame.
+        ring.write(indata)
+
+    # Opens the microphone in callback mode, which reuses the driver buffer
+    # and decouples the capture from the socket loop below.
+    with sd.RawInputStream(blocksize=CHUNK_SIZE,
+                           callback=record,
+                           channels=CHANNELS,
+                           dtype=SAMPLE_DTYPE.name,
+                           samplerate=FRAME_RATE):
         try:
 
-            # Sends the sound to the client while the server is connected.
-            while True:
+            # If the client chosen no modulated audio, sends the pure
+            # recorded audio while the server is connected. The modulator is
+            # bypassed entirely: nothing about the audio changes, so each
+            # frame goes from the ring buffer straight to the socket.
+            if modulation == NO_MOD:
+                while True:
 
-                # Records the audio from the microphone.
-                recorded = M(modulation, microphone.read(CHUNK_SIZE)[0])
+                    # Pops a recorded frame and sends it as it is.
+                    server.send(client, ring.read(FRAME_BYTES))
 
-                # If the client chosen no modulated audio,...
-                if modulation == NO_MOD:
+            # If the modulation own bandlimit already covers the capture
+            # side filter, skips that whole DSP pass.
+            elif not MOD_NEEDS_LPF[modulation]:
+                while True:
 
-                    # ... then just sends the pure recorded audio.
-                    server.send(client, recorded.encode())
+                    # Pops a recorded frame from the ring buffer.
+                    recorded = processor.reset(ring.read(FRAME_BYTES))
 
-                    continue
+                    # Modulates the recorded audio, then sends.
+                    server.send(client, recorded.modulate().encode(out))
 
-                # Filters the recorded audio.
-                filtered = recorded.lowpass()
+            # If no, sends the filtered and modulated sound to the client
+            # while the server is connected.
+            else:
+                while True:
 
-                # Modulates the filtered audio.
-                modulated = filtered.modulate()
+                    # Pops a recorded frame from the ring buffer.
+                    recorded = processor.reset(ring.read(FRAME_BYTES))
 
-                # Sends the modulated audio.
-                server.send(client, modulated.encode())
+                    # Filters and modulates the recorded audio, then sends.
+                    server.send(client,
+                                recorded.lowpass().modulate().encode(out))
 
         # Disconnected client.
         except ClientDisconnectedError:
 
-            # Gets the client address.
-            host, port = server.address(client)
-
-            # Gets the color that the client has received.
-            color = server.get_color(client)
-
-            # Formats the client name for sending.
-            nick = F().bold().paint(color, server.get_name(client))
-
-            # Say bye to him.
+            # Say bye to him. The address and the formatted nick computed on
+            # arrival are still valid, so there is no need to rebuild them.
             server.bye(client)
 
             # Logs the event.
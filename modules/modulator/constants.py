@@ -4,4 +4,8 @@ Modulator type constants.
 
 AM = 'am'
 AM_SC = 'am-sc'
-NO_MOD = 'no_mod'
\ No newline at end of file
+NO_MOD = 'no_mod'
+
+# Whether each modulation type still needs the capture side lowpass filter,
+# or its own bandlimit already makes that filter redundant.
+MOD_NEEDS_LPF = {AM: False, AM_SC: True, NO_MOD: False}
\ No newline at end of file
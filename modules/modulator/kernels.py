@@ -0,0 +1,142 @@
+"""
+Compiled kernels for the modulator hot paths.
+
+The kernels are JIT-compiled once at import time when Numba is available,
+so the streaming loops do not pay the compilation cost. Otherwise the
+modulator falls back to its NumPy implementations, which keeps Numba as an
+optional dependency.
+"""
+
+from math import cos
+
+import numpy as np
+
+from nptyping import Array
+
+from modules.modulator.settings import AM_OMEGA
+
+try:
+
+    # Numba is an optional dependency.
+    from numba import njit, prange
+
+    # Tells the modulator that the compiled kernels are available.
+    COMPILED = True
+
+# If it is unable to import,...
+except ImportError:
+
+    # ... the modulator falls back to NumPy.
+    COMPILED = False
+
+# The carrier phase step, in radians per sample, widened back to a Python
+# float so the compiled loops work on a plain scalar.
+OMEGA = float(AM_OMEGA)
+
+# The kernels are only defined when Numba is available.
+if COMPILED:
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def am_demodulate(signal: Array[float]) -> Array[float]:
+        """
+        Demodulates an AM signal in a single fused pass.
+
+        ---
+        Arguments
+        ---
+
+            signal (Array(float))
+        A signal to demodulate.
+
+        ---
+        Returns
+        ---
+
+            Array(float)
+        The demodulated signal.
+        """
+
+        # Output signal buffer.
+        out = np.empty(signal.shape[0], np.float32)
+
+        # For each sample, takes its absolute value. The parallel range
+        # lets Numba split the loop across cores and vectorize each slice.
+        for i in prange(signal.shape[0]):
+            out[i] = abs(signal[i])
+
+        # Returns the demodulated signal.
+        return out
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def am_modulate(signal: Array[float]) -> Array[float]:
+        """
+        Modulates a signal in AM, fusing the carrier generation and the
+        multiply, add and divide passes into a single loop.
+
+        ---
+        Arguments
+        ---
+
+            signal (Array(float))
+        A signal to modulate.
+
+        ---
+        Returns
+        ---
+
+            Array(float)
+        The modulated signal.
+        """
+
+        # Output signal buffer.
+        out = np.empty(signal.shape[0], np.float32)
+
+        # For each sample, generates the carrier and mixes it in. The
+        # parallel range lets Numba split the loop across cores and
+        # vectorize each slice.
+        for i in prange(signal.shape[0]):
+            carrier = cos(OMEGA * i)
+            out[i] = (signal[i] * carrier + carrier) / 2
+
+        # Returns the modulated signal.
+        return out
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def am_sc_mix(signal: Array[float]) -> Array[float]:
+        """
+        Multiplies a signal by the carrier, which both modulates and
+        demodulates it in AM-SC.
+
+        ---
+        Arguments
+        ---
+
+            signal (Array(float))
+        A signal to mix with the carrier.
+
+        ---
+        Returns
+        ---
+
+            Array(float)
+        The mixed signal.
+        """
+
+        # Output signal buffer.
+        out = np.empty(signal.shape[0], np.float32)
+
+        # For each sample, generates the carrier and multiplies. The
+        # parallel range lets Numba split the loop across cores and
+        # vectorize each slice.
+        for i in prange(signal.shape[0]):
+            out[i] = signal[i] * cos(OMEGA * i)
+
+        # Returns the mixed signal.
+        return out
+
+    # Warms the kernels up for the streaming dtypes, so the JIT compilation
+    # happens at import time instead of on the first audio frame.
+    for _warmup in (np.zeros(1, np.int16), np.zeros(1, np.float32)):
+        am_demodulate(_warmup)
+        am_modulate(_warmup)
+        am_sc_mix(_warmup)
@@ -1,30 +1,67 @@
 from __future__ import annotations
 
+from math import gcd
+
 from typing import Union
 
-from scipy.signal import firwin
+from scipy.signal import firwin, oaconvolve
 
 from nptyping import Array
 
 import numpy as np
 
-from modules.audio.settings import CHANNELS, FRAME_RATE
+from modules.audio.settings import (CHANNELS, CHUNK_SIZE, FRAME_RATE,
+                                    SAMPLE_DTYPE, SAMPLE_ITEMSIZE)
+
+from modules.modulator import kernels
 
 from modules.modulator.constants import AM, AM_SC, NO_MOD
 
 from modules.modulator.error import (InvalidModulationTypeError,
                                      InvalidSignalTypeError)
 
-from modules.modulator.settings import AM_CARRIER_FREQ, CUTOFF
+from modules.modulator.settings import AM_CARRIER_FREQ, AM_OMEGA, CUTOFF
+
+# With an integer carrier frequency and frame rate, the carrier repeats
+# after `FRAME_RATE // gcd(FRAME_RATE, AM_CARRIER_FREQ)` samples, so only
+# one period is ever computed with np.cos. Tiling it also keeps every
+# sample phase exact, with no float accumulation drift.
+CARRIER_PERIOD = np.cos(AM_OMEGA * np.arange(
+    FRAME_RATE // gcd(FRAME_RATE, int(AM_CARRIER_FREQ)), dtype=np.float32))
+
+# The carrier values only depend on the sample index, so the table for the
+# common frame length is tiled once at import time instead of per frame.
+CARRIER_LUT = np.tile(
+    CARRIER_PERIOD,
+    -(-(CHUNK_SIZE * CHANNELS) // len(CARRIER_PERIOD)))[:CHUNK_SIZE *
+                                                        CHANNELS]
 
 
 class Modulator():
 
+    # Declaring the instance attributes up front removes the per-instance
+    # __dict__, which shrinks every modulator and turns the attribute
+    # lookups on the frame path into fixed offset reads.
+    __slots__ = ('_Modulator__demodulate', '_Modulator__modulate',
+                 '_Modulator__modulation', '_Modulator__scratch',
+                 '_Modulator__signal')
+
     # Available modulation type list.
     modulations = [AM, AM_SC, NO_MOD]
 
-    def __init__(self, modulation: str, signal: Union[bytes,
-                                                      Array[int]]) -> None:
+    # Lowpass filter taps already designed, cached by cutoff frequency. The
+    # taps only depend on the cutoff and the frame rate, never on the signal
+    # length, so each cutoff pays the design only once.
+    _lowpass_cache = {}
+
+    # Carrier waves already generated, cached by signal length. Streamed
+    # frames nearly always share the same length, so each length pays the
+    # cosine generation only once.
+    _carrier_cache = {}
+
+    def __init__(self,
+                 modulation: str,
+                 signal: Union[bytes, memoryview, Array[int]] = None) -> None:
         """
         Instantiates a new modulator.
 
@@ -35,15 +72,22 @@ class Modulator():
             modulation (str)
         A modulation type to use.
 
-            signal Union(bytes, Array(int))
-        A signal to set as this modulator signal.
+            signal Union(bytes, memoryview, Array(int), None)
+        A signal to set as this modulator signal. It can also be set later
+        with the reset() method, which reuses the instance across frames.
         """
 
         # Attributes the modulation type.
         self.__set_modulation(modulation)
 
-        # Sets the signal to modulate.
-        self.__set_signal(signal)
+        # Persistent scratch buffer for the fused playback pass.
+        self.__scratch = None
+
+        # If a signal was provided,...
+        if signal is not None:
+
+            # ... sets it to modulate.
+            self.__set_signal(signal)
 
     def demodulate(self) -> Modulator:
         """
@@ -57,38 +101,99 @@ class Modulator():
         The instance itself.
         """
 
+        # Demodulates the signal with the implementation bound to the
+        # modulation type.
+        self.__signal = self.__demodulate(self.__signal)
+
+        # Returns the instance itself.
+        return self
+
+    def demodulate_lowpass(self) -> Modulator:
+        """
+        Demodulates the signal and applies the lowpass filter in a single
+        call, demodulating into a persistent scratch buffer so the playback
+        path does not allocate an intermediate array per frame.
+
+        ---
+        Returns
+        ---
+
+            Modulator
+        The instance itself.
+        """
+
+        # The signal length.
+        n = len(self.__signal)
+
+        # The persistent scratch buffer, reallocated only when the signal
+        # length changes.
+        scratch = self.__scratch
+
+        if scratch is None or len(scratch) != n:
+            scratch = self.__scratch = np.empty(n, np.float32)
+
         # Amplitude Modulation.
         if self.__modulation == AM:
 
-            # Demodulates the signal.
-            self.__signal = np.abs(self.__signal)
+            # Demodulates the signal into the scratch buffer.
+            np.abs(self.__signal, out=scratch)
 
         # Amplitude Modulation with Suppressed Carrier.
         elif self.__modulation == AM_SC:
 
-            # Generates a carrier wave.
-            carrier = self.__am_carrier()
+            # Demodulates the signal into the scratch buffer.
+            np.multiply(self.__signal, self.__am_carrier(), out=scratch)
+
+        # No modulation: there is nothing to demodulate nor to filter.
+        else:
+            return self
 
-            # Modulates the signal.
-            self.__signal = np.multiply(self.__signal, carrier)
+        # Filters the demodulated signal.
+        self.__signal = self.__lowpass(scratch)
 
         # Returns the instance itself.
         return self
 
-    def encode(self) -> bytes:
+    def encode(self, out: bytearray = None) -> bytes:
         """
         Converts the signal from NumPy array to byte buffer.
 
+        ---
+        Arguments
+        ---
+
+            out (bytearray, None)
+        A reusable buffer in which the signal will be encoded. When provided,
+        no bytes object is allocated per call.
+
         ---
         Returns
         ---
 
             bytes
-        The signal as a byte buffer.
+        The signal as a byte buffer, or a view of the written span of `out`.
         """
 
-        # Returns the signal as a byte buffer.
-        return self.__signal.astype(np.int16).tobytes()
+        # If no output buffer was provided,...
+        if out is None:
+
+            # ... and the signal is already quantized and contiguous, its
+            # raw bytes can be handed out without a conversion copy.
+            signal = self.__signal
+
+            if signal.dtype == SAMPLE_DTYPE and signal.flags.c_contiguous:
+                return signal.tobytes()
+
+            # If no, returns the signal as a brand new byte buffer.
+            return signal.astype(SAMPLE_DTYPE).tobytes()
+
+        # Quantizes the signal straight into the output buffer.
+        view = np.frombuffer(out, SAMPLE_DTYPE)
+        size = len(self.__signal)
+        view[:size] = self.__signal
+
+        # Returns the written span of the buffer.
+        return memoryview(out)[:size * SAMPLE_ITEMSIZE]
 
     def lowpass(self) -> Modulator:
         """
@@ -120,25 +225,9 @@ class Modulator():
         The instance itself.
         """
 
-        # Amplitude Modulation.
-        if self.__modulation == AM:
-
-            # Generates a carrier wave.
-            carrier = self.__am_carrier()
-
-            # Modulates the signal.
-            self.__signal = np.multiply(self.__signal, carrier)
-            self.__signal = np.add(self.__signal, carrier)
-            self.__signal = np.divide(self.__signal, 2)
-
-        # Amplitude Modulation with Suppressed Carrier.
-        elif self.__modulation == AM_SC:
-
-            # Generates a carrier wave.
-            carrier = self.__am_carrier()
-
-            # Modulates the signal.
-            self.__signal = np.multiply(self.__signal, carrier)
+        # Modulates the signal with the implementation bound to the
+        # modulation type.
+        self.__signal = self.__modulate(self.__signal)
 
         # Returns the instance itself.
         return self
@@ -155,10 +244,43 @@ class Modulator():
         The unflatted signal.
         """
 
-        # Returns the unflatted signal.
-        return np.reshape(self.__signal,
-                          (len(self.__signal) // CHANNELS, CHANNELS)).astype(
-                              np.int16)
+        # The signal, quantized only when it is not already in the sample
+        # dtype, which avoids a copy per call.
+        signal = self.__signal
+
+        if signal.dtype != SAMPLE_DTYPE:
+            signal = signal.astype(SAMPLE_DTYPE)
+
+        # Returns the unflatted signal as a reshaped view, without copying.
+        # With a single channel there is nothing to unflat.
+        return signal.reshape(-1, CHANNELS) if CHANNELS > 1 else signal
+
+    def reset(self, signal: Union[bytes, memoryview,
+                                  Array[int]]) -> Modulator:
+        """
+        Replaces the signal of this modulator, reusing the instance instead
+        of constructing a new one per frame.
+
+        ---
+        Arguments
+        ---
+
+            signal (Union(bytes, memoryview, Array(int)))
+        A signal to set as this modulator signal.
+
+        ---
+        Returns
+        ---
+
+            Modulator
+        The instance itself.
+        """
+
+        # Sets the signal to modulate.
+        self.__set_signal(signal)
+
+        # Returns the instance itself.
+        return self
 
     def __am_carrier(self) -> Array[float]:
         """
@@ -172,11 +294,117 @@ class Modulator():
         The NumPy array of the generated carrier signal.
         """
 
-        # Generates the time axis values.
-        t = np.arange(len(self.__signal))
+        # The signal length.
+        n = len(self.__signal)
+
+        # If the precomputed table covers the signal,...
+        if n <= len(CARRIER_LUT):
+
+            # ... reuses it, without any allocation.
+            return CARRIER_LUT[:n]
+
+        # If no, looks the length up in the cache.
+        carrier = self._carrier_cache.get(n)
+
+        # If this length was never seen before,...
+        if carrier is None:
+
+            # ... caches enough repetitions of the precomputed carrier
+            # period to cover the signal, which avoids np.cos entirely.
+            carrier = self._carrier_cache[n] = np.tile(
+                CARRIER_PERIOD, -(-n // len(CARRIER_PERIOD)))[:n]
 
-        # Returns a cosine wave with a frequency of `AM_CARRIER_FREQ` Hz.
-        return np.cos(2 * np.pi * t * AM_CARRIER_FREQ)
+        # Returns the cached carrier wave.
+        return carrier
+
+    def __am_demodulate(self, signal: Array[float]) -> Array[float]:
+        """
+        Demodulates an AM signal.
+
+        ---
+        Arguments
+        ---
+
+            signal (Array(float))
+        A signal to demodulate.
+
+        ---
+        Returns
+        ---
+
+            Array(float)
+        The demodulated signal.
+        """
+
+        # Returns the absolute value of the signal.
+        return np.abs(signal)
+
+    def __am_modulate(self, signal: Array[float]) -> Array[float]:
+        """
+        Modulates a signal in AM.
+
+        ---
+        Arguments
+        ---
+
+            signal (Array(float))
+        A signal to modulate.
+
+        ---
+        Returns
+        ---
+
+            Array(float)
+        The modulated signal.
+        """
+
+        # Generates a carrier wave.
+        carrier = self.__am_carrier()
+
+        # The signal length.
+        n = len(signal)
+
+        # The persistent scratch buffer, reallocated only when the signal
+        # length changes. Writing every step into it replaces the three
+        # temporaries the chained ufuncs would otherwise allocate.
+        out = self.__scratch
+
+        if out is None or len(out) != n:
+            out = self.__scratch = np.empty(n, np.float32)
+
+        # Modulates the signal, in place.
+        np.multiply(signal, carrier, out=out)
+        np.add(out, carrier, out=out)
+        np.multiply(out, 0.5, out=out)
+
+        # Returns the modulated signal.
+        return out
+
+    def __am_sc_mix(self, signal: Array[float]) -> Array[float]:
+        """
+        Multiplies a signal by the carrier, which both modulates and
+        demodulates it in AM-SC.
+
+        ---
+        Arguments
+        ---
+
+            signal (Array(float))
+        A signal to mix with the carrier.
+
+        ---
+        Returns
+        ---
+
+            Array(float)
+        The mixed signal.
+        """
+
+        # Generates a carrier wave.
+        carrier = self.__am_carrier()
+
+        # Returns the mixed signal.
+        return np.multiply(signal, carrier)
 
     def __check_modulation(self, modulation: str) -> None:
         """
@@ -227,19 +455,55 @@ class Modulator():
         The filtered signal.
         """
 
-        # Generates a FIR low pass filter.
-        lowpass = firwin(numtaps=len(signal),
-                         cutoff=cutoff,
-                         window='blackmanharris',
-                         pass_zero='lowpass',
-                         fs=FRAME_RATE)
+        # Looks the cutoff frequency up in the design cache.
+        lowpass = self._lowpass_cache.get(cutoff)
+
+        # If this cutoff was never seen before,...
+        if lowpass is None:
+
+            # ... designs a fixed length FIR low pass filter, in the float32
+            # working dtype so the convolution does not upcast the signal to
+            # float64. The taps used to be designed per frame with as many
+            # taps as samples, which made the convolution quadratic; 257
+            # taps give a more than sharp enough transition band for voice.
+            lowpass = self._lowpass_cache[cutoff] = firwin(
+                numtaps=257,
+                cutoff=cutoff,
+                window='blackmanharris',
+                pass_zero='lowpass',
+                fs=FRAME_RATE).astype(np.float32)
+
+        # Returns the filtered signal. The overlap-add convolution runs in
+        # O(N log N) instead of the O(N^2) of the direct one.
+        return oaconvolve(signal, lowpass, 'same')
+
+    def __no_mod(self, signal: Array[float]) -> Array[float]:
+        """
+        Leaves a signal untouched, for the no modulation type.
+
+        ---
+        Arguments
+        ---
+
+            signal (Array(float))
+        A signal to pass through.
+
+        ---
+        Returns
+        ---
+
+            Array(float)
+        The very same signal.
+        """
 
-        # Returns the filtered signal.
-        return np.convolve(signal, lowpass, 'same')
+        # Returns the signal untouched.
+        return signal
 
     def __set_modulation(self, modulation: str) -> None:
         """
-        Sets the modulation type to this modulator.
+        Sets the modulation type to this modulator and binds the modulation
+        specific implementations, so modulate() and demodulate() do not
+        branch on the modulation type at every frame.
 
         ---
         Arguments
@@ -255,7 +519,34 @@ class Modulator():
         # Attributes the modulation type.
         self.__modulation = modulation
 
-    def __set_signal(self, signal: Union[bytes, Array[int]]) -> None:
+        # Amplitude Modulation.
+        if modulation == AM:
+
+            # Binds the implementations, compiled if available.
+            self.__demodulate = (kernels.am_demodulate
+                                 if kernels.COMPILED else self.__am_demodulate)
+            self.__modulate = (kernels.am_modulate
+                               if kernels.COMPILED else self.__am_modulate)
+
+        # Amplitude Modulation with Suppressed Carrier.
+        elif modulation == AM_SC:
+
+            # Both directions multiply the signal by the carrier.
+            mix = kernels.am_sc_mix if kernels.COMPILED else self.__am_sc_mix
+
+            # Binds the implementations.
+            self.__demodulate = mix
+            self.__modulate = mix
+
+        # No modulation.
+        else:
+
+            # Binds the pass-through implementation.
+            self.__demodulate = self.__no_mod
+            self.__modulate = self.__no_mod
+
+    def __set_signal(
+            self, signal: Union[bytes, memoryview, Array[int]]) -> None:
         """
         Defines the signal of this modulator.
 
@@ -263,7 +554,7 @@ class Modulator():
         Arguments
         ---
 
-            signal (Union(bytes, Array(int)))
+            signal (Union(bytes, memoryview, Array(int)))
         A NumPy array signal to set.
 
         ---
@@ -275,16 +566,20 @@ class Modulator():
         """
 
         # If `signal` is neither a byte buffer nor a NumPy array,...
-        if not isinstance(signal, (bytes, np.ndarray)):
+        if not isinstance(signal, (bytes, bytearray, memoryview, np.ndarray)):
 
             # ... raises an error.
             raise InvalidSignalTypeError()
 
         # If `signal` is a byte buffer,...
-        if isinstance(signal, bytes):
+        if not isinstance(signal, np.ndarray):
 
-            # ... converts it to a NumPy array.
-            signal = np.frombuffer(signal, np.int16)
+            # ... converts it to a NumPy array, without copying the buffer.
+            signal = np.frombuffer(signal, SAMPLE_DTYPE)
 
-        # Sets the signal to this modulator.
-        self.__signal = signal.flatten()
+        # Sets the signal to this modulator, pinned to the float32 working
+        # dtype. Left as int16, the first ufunc would silently promote it to
+        # float64, doubling the memory traffic of every pass downstream.
+        # ravel() returns a view when the array is already contiguous,
+        # whereas flatten() would always copy.
+        self.__signal = signal.astype(np.float32, copy=False).ravel()
@@ -2,8 +2,17 @@
 Default settings for modulators.
 """
 
+import numpy as np
+
+from modules.audio.settings import FRAME_RATE
+
 # The AM carrier signal wave frequency. In this case, 3 KHz.
 AM_CARRIER_FREQ = 3e3
 
+# The carrier phase advance per sample, in radians, precomputed once in the
+# float32 working dtype so the carrier generation is a single broadcast
+# multiply with no per-frame scalar arithmetic or dtype coercion.
+AM_OMEGA = np.float32(2.0 * np.pi * AM_CARRIER_FREQ / FRAME_RATE)
+
 # Lowpass filter cutoff frequency. In this case is 1 KHz.
 CUTOFF = 1e3
@@ -1,22 +1,97 @@
-from socket import gaierror, socket, timeout
+# The UTF-8 encoder is bound once at import, which skips the codec registry
+# lookup that encode('utf-8') performs per call.
+from codecs import utf_8_encode
 
-from typing import Optional
+from socket import (AF_INET, IPPROTO_TCP, SOCK_STREAM, SOL_SOCKET, SO_RCVBUF,
+                    SO_SNDBUF, TCP_NODELAY, gaierror, getaddrinfo, socket,
+                    timeout)
+
+from struct import pack, unpack_from
+
+from time import monotonic
+
+from typing import Optional, Tuple
 
 from modules.modulator.error import InvalidModulationTypeError
 
 from modules.modulator.modulator import Modulator
 
 from modules.socket.error import (ConnectionTimeoutError, InvalidNameError,
-                                  InvalidPortError, UndefinedNameError,
-                                  UnknownHostError)
+                                  InvalidPortError, SocketError,
+                                  UndefinedNameError, UnknownHostError)
+
+from modules.socket.node import Node, _decode, _keep_alive
+
+from modules.socket.settings import (ADDRESS_TTL, ATTEMPT_TIME, BUFFER_SIZE,
+                                     DEFAULT_HOST, DEFAULT_PORT, HEADER_SIZE,
+                                     PACKAGE_SIZE, RECV_BATCH)
+
+# `sendmsg` fuses the length prefix and the payload into a single syscall
+# without concatenating them. It is not available on every platform.
+_HAS_SENDMSG = hasattr(socket, 'sendmsg')
+
+# The available modulation types, frozen once for hashed membership checks
+# without the per-connect attribute lookup chain.
+_MODULATIONS = frozenset(Modulator.modulations)
+
+# Server addresses already resolved, cached with their resolution time so a
+# reconnect to a known host skips the blocking DNS lookup.
+_ADDRESSES = {}
+
+
+def _resolve(hostname: str, port: int) -> Tuple[int, tuple]:
+    """
+    Resolves a server address, cached for `ADDRESS_TTL` seconds.
+
+    ---
+    Arguments
+    ---
+
+        hostname (str)
+    A hostname to resolve.
+
+        port (int)
+    A port number of the server.
+
+    ---
+    Returns
+    ---
+
+        Tuple(int, tuple)
+    The socket family and the resolved socket address, respectively.
+    """
+
+    # Looks the address up in the cache.
+    cached = _ADDRESSES.get((hostname, port))
+
+    # If it is there and still fresh,...
+    if cached is not None and monotonic() - cached[2] < ADDRESS_TTL:
+
+        # ... skips the resolver entirely.
+        return cached[0], cached[1]
 
-from modules.socket.node import Node
+    # If no, performs the blocking lookup once, pinned to IPv4, since the
+    # server only listens on an AF_INET socket and a dual-stack host could
+    # hand back an IPv6 entry first...
+    family, _type, _proto, _canonname, sockaddr = getaddrinfo(
+        hostname, port, family=AF_INET, type=SOCK_STREAM)[0]
 
-from modules.socket.settings import (ATTEMPT_TIME, DEFAULT_HOST, DEFAULT_PORT,
-                                     ENCODING, PACKAGE_SIZE)
+    # ... and caches the result with its resolution time.
+    _ADDRESSES[(hostname, port)] = (family, sockaddr, monotonic())
+
+    # Returns the resolved address.
+    return family, sockaddr
 
 
 class Client(Node):
+
+    # Declaring the attributes up front removes the per-instance __dict__,
+    # and the single underscore spares the name mangling, so the accesses
+    # on the streaming path are plain slot reads.
+    __slots__ = ('_address', '_color', '_modulation', '_name', '_name_bytes',
+                 '_recv_buffer', '_recv_end', '_recv_start', '_recv_view',
+                 '_server')
+
     def __init__(self, name: str = None) -> None:
         """
         Creates a socket client instance.
@@ -29,12 +104,12 @@ class Client(Node):
         A name for this client.
         """
 
-        # Gives the name to this client.
-        self.set_name(name)
-
         # Calls the parent init method.
         super().__init__()
 
+        # Gives the name to this client.
+        self.set_name(name)
+
     def __str__(self) -> str:
         """
         Called when printing this instance.
@@ -63,7 +138,7 @@ class Client(Node):
         """
 
         # If the client does not have a name,...
-        if self.__name is None:
+        if self._name is None:
 
             # ... raises an error.
             raise UndefinedNameError()
@@ -112,7 +187,7 @@ class Client(Node):
         self.check_name()
 
         # If the modulation type is not among those available,...
-        if modulation not in Modulator.modulations:
+        if modulation not in _MODULATIONS:
 
             # raises an error.
             raise InvalidModulationTypeError(modulation)
@@ -137,14 +212,32 @@ class Client(Node):
             # Assings the address to a variable.
             server = (hostname, port)
 
-            # Instantiates a socket object with the default settings.
-            sock = socket()
+            try:
+
+                # Resolves the server address, cached across reconnects.
+                family, sockaddr = _resolve(hostname, port)
+
+            # An unknown or nonexistent host fails right here, before any
+            # socket exists, so the error carries none.
+            except gaierror:
+                raise UnknownHostError(None, hostname, port)
+
+            # Instantiates a socket object for the resolved family.
+            sock = socket(family)
+
+            # Disables Nagle's algorithm, so the short handshake strings do
+            # not sit in the kernel waiting to be coalesced.
+            sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+
+            # Enlarges the kernel buffers past the default window ceiling.
+            sock.setsockopt(SOL_SOCKET, SO_RCVBUF, BUFFER_SIZE)
+            sock.setsockopt(SOL_SOCKET, SO_SNDBUF, BUFFER_SIZE)
 
             # Sets the connection attempt timeout.
             sock.settimeout(ATTEMPT_TIME)
 
-            # Tries to connect.
-            sock.connect(server)
+            # Tries to connect, straight to the resolved address.
+            sock.connect(sockaddr)
 
         # Connection with the server was refused.
         except ConnectionRefusedError:
@@ -154,10 +247,6 @@ class Client(Node):
         except (EOFError, KeyboardInterrupt):
             raise KeyboardInterrupt()
 
-        # Unknown or nonexistent host.
-        except gaierror:
-            raise UnknownHostError(sock, hostname, port)
-
         # Connection timeout.
         except timeout:
             raise ConnectionTimeoutError()
@@ -169,29 +258,46 @@ class Client(Node):
         # Resets the socket timeout setting.
         sock.settimeout(None)
 
+        # With no per-recv timeout, a crashed server would hang the
+        # blocking receives forever; keepalive probing bounds that.
+        _keep_alive(sock)
+
         # The client socket address.
-        self.__address = sock.getsockname()
+        self._address = sock.getsockname()
+
+        # Reusable batch receive buffer, allocated once per connection and
+        # large enough for several packages, so one syscall can pull as many
+        # as the kernel already has.
+        self._recv_buffer = bytearray(PACKAGE_SIZE * RECV_BATCH)
+
+        # A memory view allows slicing the buffer without copying it.
+        self._recv_view = memoryview(self._recv_buffer)
+
+        # The consumed and filled offsets of the batch buffer.
+        self._recv_start = 0
+        self._recv_end = 0
 
         # Event log list.
-        self.set_logs([])
+        self._logs = []
 
         # Chosen modulation type.
-        self.__modulation = modulation
+        self._modulation = modulation
 
         # Server address.
-        self.__server = server
+        self._server = server
 
         # The client socket.
-        self.set_socket(sock)
+        self._socket = sock
 
-        # Sends the client name automatically.
-        self.send_str(self.__name)
+        # Sends the client name automatically, from the bytes encoded once
+        # by set_name().
+        self.send(self._name_bytes)
 
         # Receives the log accent color.
-        self.__color = self.recv_str()
+        self._color = self.recv_str()
 
         # Sends the modulation type automatically.
-        self.send_str(self.__modulation)
+        self.send_str(self._modulation)
 
     def disconnect(self) -> None:
         """
@@ -202,22 +308,28 @@ class Client(Node):
         if self.is_open():
 
             # Closes the socket.
-            self.get_socket().close()
+            self._socket.close()
 
         # Reset the client socket address.
-        self.__address = None
+        self._address = None
 
         # Reset the events logs.
-        self.set_logs(None)
+        self._logs = None
 
         # Reset the modulation type.
-        self.__modulation = None
+        self._modulation = None
+
+        # Reset the receive buffer.
+        self._recv_buffer = None
+        self._recv_view = None
+        self._recv_start = 0
+        self._recv_end = 0
 
         # Reset the server address.
-        self.__server = None
+        self._server = None
 
         # Reset the socket.
-        self.set_socket(None)
+        self._socket = None
 
     def get_name(self) -> str:
         """
@@ -232,7 +344,7 @@ class Client(Node):
         """
 
         # Returns the client name.
-        return self.__name
+        return self._name
 
     def recv(self) -> bytes:
         """
@@ -246,11 +358,108 @@ class Client(Node):
         The received package.
         """
 
-        # Checks whether the socket is already open.
-        self.check_connection()
+        # Returns an owned copy of the received package.
+        return bytes(self.recv_into())
+
+    # The trailing defaults bind the hot module-level names at definition
+    # time, turning their per-call LOAD_GLOBAL lookups into LOAD_FAST.
+    def recv_into(self,
+                  _header: int = HEADER_SIZE,
+                  _unpack_from=unpack_from) -> memoryview:
+        """
+        Receives a whole framed package from the server out of this client
+        batch buffer. Each syscall pulls as many packages as the kernel
+        already has, and the following calls are served straight from the
+        buffer without touching the socket.
+
+        ---
+        Returns
+        ---
+
+            memoryview
+        A view of the received package payload. It is empty when the
+        connection was closed, and is only valid until the next call.
 
-        # Returns the received package.
-        return self.get_socket().recv(PACKAGE_SIZE)
+        ---
+        Raises
+        ---
+
+            SocketError
+        The socket is closed or undefined.
+        """
+
+        # Bytes needed before the package can be served: the header first,
+        # then the header plus the payload length it carries.
+        needed = _header
+        length = None
+
+        try:
+
+            # The socket and the buffer are resolved once for the filling
+            # loop. Checking the connection up front would cost a call per
+            # package; a closed or never connected client fails on these
+            # reads instead, through the except below.
+            sock = self._socket
+            view = self._recv_view
+            start = self._recv_start
+            end = self._recv_end
+
+            while True:
+
+                # Once the header is buffered, learns the payload length.
+                if length is None and end - start >= _header:
+                    (length, ) = _unpack_from('!I', view, start)
+                    needed = _header + length
+
+                    # A package larger than the whole batch buffer could
+                    # never be completed in place, and the full buffer
+                    # would misread the zero-byte receive below as a
+                    # closed connection, so the buffer grows to fit it.
+                    if needed > len(view):
+                        buffer = bytearray(needed)
+                        buffer[:end - start] = view[start:end]
+                        self._recv_buffer = buffer
+                        view = self._recv_view = memoryview(buffer)
+                        end -= start
+                        start = 0
+
+                # If the whole package is buffered, serves it.
+                if length is not None and end - start >= needed:
+                    break
+
+                # Compacts the pending bytes to the front when the tail
+                # cannot fit the rest of the package.
+                if len(view) - end < needed - (end - start):
+                    view[:end - start] = view[start:end]
+                    end -= start
+                    start = 0
+
+                # Receives whatever the kernel has into the tail, without
+                # allocating. Under load this batches several packages into
+                # a single syscall.
+                size = sock.recv_into(view[end:], len(view) - end)
+
+                # If the connection was closed,...
+                if size == 0:
+
+                    # ... serves an empty view.
+                    self._recv_start = self._recv_end = 0
+
+                    return view[:0]
+
+                # Accounts the received bytes.
+                end += size
+
+        # The socket and the buffer are None when the client is closed.
+        except (AttributeError, TypeError):
+            raise SocketError()
+
+        # Consumes one package from the buffer.
+        self._recv_start = start + needed
+        self._recv_end = end
+
+        # Returns a view of the package payload, past its header.
+        return view[start + _header:start + needed]
 
     def recv_str(self) -> str:
         """
@@ -264,10 +473,17 @@ class Client(Node):
         The received string.
         """
 
-        # Returns the received string.
-        return self.recv().decode(ENCODING)
-
-    def send(self, package: bytes, ensure: bool = True) -> Optional[int]:
+        # Returns the received string, decoded through the ASCII fast path
+        # when possible.
+        return _decode(self.recv())
+
+    # The trailing defaults bind the hot module-level names at definition
+    # time, turning their per-call LOAD_GLOBAL lookups into LOAD_FAST.
+    def send(self,
+             package: bytes,
+             ensure: bool = True,
+             _pack=pack,
+             _gather: bool = _HAS_SENDMSG) -> Optional[int]:
         """
         Sends a package to the server.
 
@@ -287,16 +503,54 @@ class Client(Node):
 
             Optional(int)
         Number of bytes sent, if ensure flag is True.
+
+        ---
+        Raises
+        ---
+
+            SocketError
+        The socket is closed or undefined.
         """
 
-        # Checks whether the socket is already open.
-        self.check_connection()
+        # The length prefix that frames the package.
+        header = _pack('!I', len(package))
+
+        try:
+
+            # Sends the framed package to the server with a single
+            # gathering syscall where the platform has one, with or without
+            # delivery guarantee. Checking the connection up front would
+            # cost a call per package; a closed socket surfaces on use.
+            if ensure and _gather:
+
+                # How long the whole frame is.
+                total = len(header) + len(package)
+
+                # The first attempt, gathering both pieces.
+                sent = self._socket.sendmsg([header, package])
+
+                # `sendmsg` has `send` semantics: with the kernel buffer
+                # full it can write fewer bytes than asked, and a short
+                # write would desync the length-prefixed stream, so the
+                # tail is pushed until the frame is out whole.
+                if sent < total:
+                    self._socket.sendall(
+                        memoryview(header + bytes(package))[sent:])
+
+                return total
+
+            return self._socket.sendall(header + bytes(package))
 
-        # Sends the package to the server, with or without delivery guarantee.
-        return self.get_socket().send(
-            package) if ensure else self.get_socket().sendall(package)
+        # The socket is None when the client is closed.
+        except AttributeError:
+            raise SocketError()
 
-    def send_str(self, string: str, ensure: bool = True) -> Optional[int]:
+    # The trailing default binds the bound codec at definition time,
+    # turning its per-call LOAD_GLOBAL lookup into LOAD_FAST.
+    def send_str(self,
+                 string: str,
+                 ensure: bool = True,
+                 _encode=utf_8_encode) -> Optional[int]:
         """
         Sends a string to the server.
 
@@ -318,9 +572,9 @@ class Client(Node):
         Number of bytes sent, if ensure flag is True.
         """
 
-        # Sends the encoded string to the server, with or without delivery
-        # guarantee.
-        return self.send(string.encode(ENCODING), ensure)
+        # Sends the string, encoded with the bound codec, to the server,
+        # with or without delivery guarantee.
+        return self.send(_encode(string)[0], ensure)
 
     def set_name(self, name: str = None) -> None:
         """
@@ -348,10 +602,12 @@ class Client(Node):
             if not name:
 
                 # ...raises an error.
-                raise InvalidNameError(self.get_socket())
+                raise InvalidNameError(self._socket)
 
             # If no, convert it to a string.
             name = str(name)
 
-        # Attributes the name.
-        self.__name = name
+        # Attributes the name, encoding it once here instead of on every
+        # connection handshake.
+        self._name = name
+        self._name_bytes = None if name is None else utf_8_encode(name)[0]
@@ -8,20 +8,34 @@ class SocketError(Exception):
     Some fundamental socket error.
     """
 
+    # No per-instance state to store.
+    __slots__ = ()
+
 
 class ClientDisconnectedError(SocketError):
     """
     Client disconnected error
     """
 
+    # No per-instance state to store.
+    __slots__ = ()
+
 
 class ConnectionTimeoutError(SocketError):
     """
     Connection attempt timed out.
     """
 
+    # No per-instance state to store.
+    __slots__ = ()
+
 
 class InvalidClientError(SocketError):
+
+    # Declaring the attributes up front stores them in fixed slots
+    # instead of the instance dict.
+    __slots__ = ('client', 'socket')
+
     def __init__(self, sock: socket, client: socket) -> None:
         """
         Client not present in the server client list.
@@ -44,6 +58,11 @@ class InvalidClientError(SocketError):
 
 
 class InvalidNameError(SocketError):
+
+    # Declaring the attributes up front stores them in fixed slots
+    # instead of the instance dict.
+    __slots__ = ('socket', )
+
     def __init__(self, sock: socket) -> None:
         """
         Empty client name.
@@ -62,6 +81,11 @@ class InvalidNameError(SocketError):
 
 
 class InvalidPortError(SocketError):
+
+    # Declaring the attributes up front stores them in fixed slots
+    # instead of the instance dict.
+    __slots__ = ('port', )
+
     def __init__(self, port: Any) -> None:
         """
         Invalid port number for a socket.
@@ -80,6 +104,11 @@ class InvalidPortError(SocketError):
 
 
 class PortAlreadyUsedError(SocketError):
+
+    # Declaring the attributes up front stores them in fixed slots
+    # instead of the instance dict.
+    __slots__ = ('port', 'socket')
+
     def __init__(self, sock: socket, port: Any) -> None:
         """
         Port number already in use.
@@ -102,6 +131,11 @@ class PortAlreadyUsedError(SocketError):
 
 
 class PortOutOfRangeError(SocketError):
+
+    # Declaring the attributes up front stores them in fixed slots
+    # instead of the instance dict.
+    __slots__ = ('port', )
+
     def __init__(self, port: Any) -> None:
         """
         Port number out of range.
@@ -124,8 +158,16 @@ class UndefinedNameError(SocketError):
     Undefined client name.
     """
 
+    # No per-instance state to store.
+    __slots__ = ()
+
 
 class UnknownHostError(SocketError):
+
+    # Declaring the attributes up front stores them in fixed slots
+    # instead of the instance dict.
+    __slots__ = ('hostname', 'port', 'socket')
+
     def __init__(self, sock: socket, hostname: Any, port: Any) -> None:
         """
         Unknown host to connect.
@@ -149,3 +191,4 @@ class UnknownHostError(SocketError):
         self.port = port
 
         super().__init__()
+
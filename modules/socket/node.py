@@ -1,15 +1,124 @@
 from abc import ABC, abstractmethod
 
-from socket import socket
+from codecs import utf_8_decode
 
-from typing import List
+from queue import SimpleQueue
+
+from socket import IPPROTO_TCP, SOL_SOCKET, SO_KEEPALIVE, socket
+
+from threading import Lock, Thread
+
+import sys
+
+# The per-probe keepalive knobs are Linux specific. Where they are missing,
+# the plain SO_KEEPALIVE defaults still apply.
+try:
+    from socket import TCP_KEEPCNT, TCP_KEEPIDLE, TCP_KEEPINTVL
+except ImportError:
+    TCP_KEEPCNT = TCP_KEEPIDLE = TCP_KEEPINTVL = None
 
 from modules.socket.error import SocketError
 
+from modules.socket.settings import (KEEPALIVE_COUNT, KEEPALIVE_IDLE,
+                                     KEEPALIVE_INTERVAL)
+
 from modules.utils.utils import clear
 
+def _decode(package: bytes) -> str:
+    """
+    Decodes a received package into a string.
+
+    ---
+    Arguments
+    ---
+
+        package (bytes)
+    A package to decode.
+
+    ---
+    Returns
+    ---
+
+        str
+    The decoded string.
+    """
+
+    # Nearly every control string is plain ASCII, which needs no UTF-8
+    # validation at all, so the ASCII decoder handles those directly.
+    if package.isascii():
+        return package.decode('ascii')
+
+    # Anything else goes through the full UTF-8 decoder.
+    return utf_8_decode(package)[0]
+
+
+def _keep_alive(sock: socket) -> None:
+    """
+    Turns on TCP keepalive probing on a connected socket, so the kernel
+    detects a dead peer in bounded time and the blocking receive paths
+    fail instead of hanging forever on a half-open connection.
+
+    ---
+    Arguments
+    ---
+
+        sock (socket)
+    A connected socket to probe.
+    """
+
+    # Lets the kernel probe the peer while the connection sits idle.
+    sock.setsockopt(SOL_SOCKET, SO_KEEPALIVE, 1)
+
+    # Where the platform exposes the probing knobs,...
+    if TCP_KEEPIDLE is not None:
+
+        # ... bounds the detection time: probing starts after the idle
+        # period and the peer is declared dead after the unanswered count.
+        sock.setsockopt(IPPROTO_TCP, TCP_KEEPIDLE, KEEPALIVE_IDLE)
+        sock.setsockopt(IPPROTO_TCP, TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+        sock.setsockopt(IPPROTO_TCP, TCP_KEEPCNT, KEEPALIVE_COUNT)
+
+
+# The queue through which the rendered log screens reach the writer thread.
+_log_queue = SimpleQueue()
+
+
+def _log_writer() -> None:
+    """
+    Consumes rendered log screens from the queue and writes each one to the
+    standard output as a single chunk of bytes. Running in its own thread,
+    it keeps the stdio lock, the encoding and the flush away from the
+    threads that actually handle the clients.
+    """
+
+    # Writes the screens forever, in arrival order.
+    while True:
+
+        # Waits for the next rendered screen.
+        screen = _log_queue.get()
+
+        # Clears the terminal before printing it.
+        clear()
+
+        # Writes the whole screen with a single call, then flushes it.
+        sys.stdout.buffer.write(screen)
+        sys.stdout.buffer.flush()
+
+
+# The writer thread, started once at import time. Being a daemon, it does
+# not prevent the program from exiting.
+_log_thread = Thread(target=_log_writer, daemon=True, name='log-writer')
+_log_thread.start()
+
 
 class Node(ABC):
+
+    # Declaring the attributes up front removes the per-instance __dict__,
+    # and the single underscore spares the name mangling, so the accesses
+    # on the per-message paths are plain slot reads.
+    __slots__ = ('_logs', '_render_lock', '_rendered', '_screen',
+                 '_socket')
+
     @abstractmethod
     def __init__(self) -> None:
         """
@@ -17,10 +126,17 @@ class Node(ABC):
         """
 
         # Socket object.
-        self.__socket = None
+        self._socket = None
 
         # Event log list.
-        self.__logs = None
+        self._logs = None
+
+        # The rendered screen cache and how many logs it already covers,
+        # with the lock that keeps its update atomic across the handler
+        # threads that log concurrently.
+        self._screen = None
+        self._rendered = 0
+        self._render_lock = Lock()
 
     def check_connection(self) -> None:
         """
@@ -46,36 +162,6 @@ class Node(ABC):
         Closes this socket connection.
         """
 
-    def get_logs(self) -> List[str]:
-        """
-        Allows the child class to get the log list attribute.
-
-        ---
-        Returns
-        ---
-
-            List(str)
-        The log list of this socket.
-        """
-
-        # Returns the log list attribute.
-        return self.__logs
-
-    def get_socket(self) -> socket:
-        """
-        Allows the child class to get the socket attribute.
-
-        ---
-        Returns
-        ---
-
-            socket
-        The socket of this socket.
-        """
-
-        # Returns the socket attribute.
-        return self.__socket
-
     def is_open(self) -> bool:
         """
         Checks whether the socket is already open.
@@ -89,7 +175,7 @@ class Node(ABC):
         """
 
         # The socket is closed when the attribute is None.
-        return self.__socket is not None
+        return self._socket is not None
 
     def log(self, message: str = None) -> None:
         """
@@ -110,41 +196,37 @@ class Node(ABC):
         if message is not None:
 
             # ... appends it to the event log list.
-            self.__logs.append(message)
-
-        # Clears screen before printing the list.
-        clear()
-
-        # Prints all of the event messages.
-        for line in self.__logs:
-            print(line, end='')
+            self._logs.append(message)
 
-    def set_logs(self, logs: List[str]) -> None:
-        """
-        Allows the child class to set the log list attribute.
+        # The cache update spans several reads and writes, and the handler
+        # threads log concurrently, so it runs under the render lock: two
+        # racing callers would otherwise both render the same tail and
+        # bake the duplicate into every later redraw.
+        with self._render_lock:
 
-        ---
-        Arguments
-        ---
+            # The event logs and the screen cache.
+            logs = self._logs
+            screen = self._screen
 
-            logs (List(str))
-        The log list to be defined as the log list attribute.
-        """
+            # If the cache does not exist yet, or covers logs that a
+            # reconnect discarded,...
+            if screen is None or self._rendered > len(logs):
 
-        # Sets the log list attribute.
-        self.__logs = logs
+                # ... starts it over.
+                screen = self._screen = bytearray()
+                self._rendered = 0
 
-    def set_socket(self, sock: socket) -> None:
-        """
-        Allows the child class to set the socket attribute.
+            # If some logs were never rendered,...
+            if self._rendered < len(logs):
 
-        ---
-        Arguments
-        ---
+                # ... renders and encodes just those, extending the cache,
+                # so the unchanged history is never joined again.
+                screen += ''.join(map(str, logs[self._rendered:])).encode()
+                self._rendered = len(logs)
 
-            sock (socket)
-        The socket to be defined as the socket attribute.
-        """
+            # Snapshots the rendered screen while nobody can extend it.
+            snapshot = bytes(screen)
 
-        # Sets the socket attribute.
-        self.__socket = sock
+        # Hands the snapshot to the writer thread, so this caller never
+        # blocks on stdio.
+        _log_queue.put(snapshot)
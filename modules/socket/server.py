@@ -1,24 +1,62 @@
+# The UTF-8 encoder is bound once at import, which skips the codec registry
+# lookup that encode('utf-8') performs per call.
+from codecs import utf_8_encode
+
 from itertools import cycle
 
 from select import select
 
-from socket import socket
+from selectors import DefaultSelector, EVENT_READ
+
+from socket import (IPPROTO_TCP, SHUT_RDWR, SOL_SOCKET, SO_RCVBUF,
+                    SO_REUSEADDR, SO_SNDBUF, TCP_NODELAY, socket)
+
+from struct import pack, unpack
+
+from threading import Lock
 
 from typing import List, Optional, Tuple
 
+# `SO_REUSEPORT` lets the kernel load balance between several listeners.
+# It is not available on every platform.
+try:
+    from socket import SO_REUSEPORT
+except ImportError:
+    SO_REUSEPORT = None
+
 from modules.formatter.formatter import Formatter as F
 
 from modules.socket.error import (ClientDisconnectedError, InvalidClientError,
                                   InvalidPortError, PortAlreadyUsedError,
-                                  PortOutOfRangeError)
+                                  PortOutOfRangeError, SocketError)
+
+from modules.socket.node import Node, _decode, _keep_alive
 
-from modules.socket.node import Node
+from modules.socket.settings import (ATTEMPT_TIME, BACKLOG_SIZE, BUFFER_SIZE,
+                                     COLORS, DEFAULT_PORT, HEADER_SIZE)
 
-from modules.socket.settings import (BACKLOG_SIZE, COLORS, DEFAULT_PORT,
-                                     ENCODING, PACKAGE_SIZE)
+# `sendmsg` fuses the length prefix and the payload into a single syscall
+# without concatenating them. It is not available on every platform.
+_HAS_SENDMSG = hasattr(socket, 'sendmsg')
+
+
+# The client accent colors encoded once, since every color constant is sent
+# to each client that receives it during the handshake.
+_COLOR_BYTES = {color: utf_8_encode(color)[0] for color in COLORS}
 
 
 class Server(Node):
+
+    # Declaring the attributes up front removes the per-instance __dict__,
+    # and the single underscore spares the name mangling, so the accesses
+    # on the per-message paths are plain slot reads. The clients live in
+    # parallel arrays indexed through `_index`, so each lookup costs one
+    # hash plus one flat list load.
+    __slots__ = ('_broadcast_version', '_client_colors', '_color', '_colors',
+                 '_compiled_broadcast', '_compiled_version', '_index',
+                 '_lock', '_modulations', '_names', '_port', '_selector',
+                 '_sockets')
+
     def __init__(self, color: str) -> None:
         """
         Creates a socket server instance.
@@ -35,10 +73,14 @@ class Server(Node):
         F().check_color(color)
 
         # Server log accent color.
-        self.__color = color
+        self._color = color
 
         # Available log accent colors for the incoming clients.
-        self.__client_colors = cycle(COLORS)
+        self._client_colors = cycle(COLORS)
+
+        # Guards the client roster, since hello() and bye() mutate the
+        # parallel arrays from different handler threads.
+        self._lock = Lock()
 
         # Calls the parent init method.
         super().__init__()
@@ -70,7 +112,7 @@ class Server(Node):
             self.check_connection()
 
             # ... and returns the socket address of this server.
-            return self.get_socket().getsockname()
+            return self._socket.getsockname()
 
         # Checks the client connection.
         self.check_client(client)
@@ -83,8 +125,10 @@ class Server(Node):
                   black_list: List[socket] = None,
                   ensure: bool = True) -> None:
         """
-        Sends a package to all of this server clients. A blacklist can be
-        provided with clients which the package should not be sent.
+        Sends a package to all of this server clients, delivering to each
+        one as it becomes writable, so a single backpressured client does
+        not delay the others. A blacklist can be provided with clients
+        which the package should not be sent.
 
         ---
         Arguments
@@ -97,7 +141,8 @@ class Server(Node):
         A list of clients which the package should not be sent.
 
             ensure (bool, True)
-        Sets whether the package should be guaranteed delivery.
+        Kept for interface compatibility. The fan-out always completes the
+        delivery to every client that stays connected.
         """
 
         # If `black_list` was not provided,...
@@ -109,11 +154,76 @@ class Server(Node):
         # Checks whether the socket is already open.
         self.check_connection()
 
-        # For each connected client,...
-        for client in list(set(self.__clients) - set(black_list)):
+        # The blacklist as a set, for hashed membership checks.
+        black_list = frozenset(black_list)
+
+        # The framed package, composed once and shared by every client.
+        frame = memoryview(pack('!I', len(package)) + bytes(package))
+
+        # Delivers the frame to every client not blacklisted.
+        self.__fan_out(frame, black_list)
+
+    def broadcast_many(self,
+                       packages: List[bytes],
+                       black_list: List[socket] = None,
+                       ensure: bool = True) -> None:
+        """
+        Sends several packages to all of this server clients with a single
+        coalesced write per client, instead of one write per package. A
+        blacklist can be provided with clients which the packages should
+        not be sent.
+
+        ---
+        Arguments
+        ---
+
+            packages (List(bytes))
+        The packages to send, in order.
+
+            black_list (List(socket), None)
+        A list of clients which the packages should not be sent.
+
+            ensure (bool, True)
+        Kept for interface compatibility. The fan-out always completes the
+        delivery to every client that stays connected.
+        """
+
+        # If `black_list` was not provided,...
+        if black_list is None:
+
+            # ... then assigns it an empty list.
+            black_list = []
 
-            # ... sends the package.
-            self.send(client, package, ensure)
+        # Checks whether the socket is already open.
+        self.check_connection()
+
+        # If there is nothing to send,...
+        if not packages:
+
+            # ... there is nothing to do.
+            return
+
+        # The blacklist as a set, for hashed membership checks.
+        black_list = frozenset(black_list)
+
+        # Every frame, length prefix and payload interleaved.
+        parts = []
+
+        # For each package,...
+        for package in packages:
+
+            # ... appends its length prefix...
+            parts.append(pack('!I', len(package)))
+
+            # ... and then the package itself.
+            parts.append(bytes(package))
+
+        # All the frames fused into a single buffer, composed once and
+        # shared by every client, so each one costs a single write.
+        frame = memoryview(b''.join(parts))
+
+        # Delivers the frames to every client not blacklisted.
+        self.__fan_out(frame, black_list)
 
     def broadcast_str(self,
                       string: str,
@@ -137,9 +247,9 @@ class Server(Node):
         Sets whether the string should be guaranteed delivery.
         """
 
-        # Sends the encoded string to all of the connected clients, except for
-        # those among the black list.
-        self.broadcast(string.encode(ENCODING), black_list, ensure)
+        # Sends the string, encoded with the bound codec, to all of the
+        # connected clients, except for those among the black list.
+        self.broadcast(utf_8_encode(string)[0], black_list, ensure)
 
     def bye(self, client: socket) -> None:
         """
@@ -153,15 +263,47 @@ class Server(Node):
         A client socket to disconnect.
         """
 
-        # Checks whether the client is connected to this server.
-        self.check_client(client)
-
-        # Close the client socket.
+        # The removal spans several structures, so it runs under the
+        # roster lock, atomically against hello() and concurrent byes.
+        with self._lock:
+
+            try:
+
+                # Removes the client from the index. An unknown client is
+                # rejected here, before its socket is touched.
+                index = self._index.pop(client)
+
+            # An unknown client surfaces as a missing key.
+            except KeyError:
+                raise InvalidClientError(self._socket, client)
+
+            # The last client fills the freed slot, which keeps the
+            # parallel arrays contiguous without shifting the tail.
+            last = self._sockets[-1]
+
+            if last is not client:
+                self._sockets[index] = last
+                self._colors[index] = self._colors[-1]
+                self._names[index] = self._names[-1]
+                self._modulations[index] = self._modulations[-1]
+                self._index[last] = index
+
+            # Drops the now duplicated tail entries.
+            self._sockets.pop()
+            self._colors.pop()
+            self._names.pop()
+            self._modulations.pop()
+
+            # The roster changed, so the specialized fan-out is stale.
+            # It is also dropped right away: its bindings reference the
+            # departing client, which would otherwise stay pinned until
+            # the next compilation.
+            self._broadcast_version += 1
+            self._compiled_broadcast = None
+
+        # Close the client socket, now that it is out of the roster.
         client.close()
 
-        # Removes the client from the server client list.
-        del self.__clients[client]
-
     def check_client(self, client: socket) -> None:
         """
         Checks whether a client is connected to this server.
@@ -184,11 +326,11 @@ class Server(Node):
         # Checks whether the socket is already open.
         self.check_connection()
 
-        # If the client is not present in the server client list,...
-        if client not in self.__clients.keys():
+        # If the client is not present in the server client index,...
+        if client not in self._index:
 
             # ... raises an error.
-            raise InvalidClientError(self.get_socket(), client)
+            raise InvalidClientError(self._socket, client)
 
     def connect(self, host: str = '', port: int = DEFAULT_PORT) -> None:
         """
@@ -229,6 +371,14 @@ class Server(Node):
             # Instantiates a socket object with the default settings.
             sock = socket()
 
+            # Allows rebinding the address right after a restart.
+            sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+
+            # Where the platform supports it, also lets the kernel load
+            # balance incoming connections between listeners.
+            if SO_REUSEPORT is not None:
+                sock.setsockopt(SOL_SOCKET, SO_REUSEPORT, 1)
+
             # Binds the host and the port to the socket.
             sock.bind((host, port))
 
@@ -244,20 +394,39 @@ class Server(Node):
         except ValueError:
             raise InvalidPortError(port)
 
-        # Connected clients.
-        self.__clients = {}
+        # Connected clients, as an index into parallel arrays.
+        self._index = {}
+        self._sockets = []
+        self._colors = []
+        self._names = []
+        self._modulations = []
+
+        # The specialized fan-out, compiled on demand for the current
+        # roster, and the version counters that tell when it is stale.
+        self._broadcast_version = 0
+        self._compiled_broadcast = None
+        self._compiled_version = -1
 
         # Event log list.
-        self.set_logs([])
+        self._logs = []
 
         # Connection port.
-        self.__port = port
+        self._port = port
 
         # The server socket.
-        self.set_socket(sock)
+        self._socket = sock
 
         # Wait for new connections.
-        self.get_socket().listen(BACKLOG_SIZE)
+        self._socket.listen(BACKLOG_SIZE)
+
+        # The listener never blocks in accept() itself; readiness comes
+        # from the persistent selector registration below.
+        self._socket.setblocking(False)
+
+        # Registers the listener once, so every hello() reuses the same
+        # registration instead of rebuilding a select set per call.
+        self._selector = DefaultSelector()
+        self._selector.register(self._socket, EVENT_READ)
 
     def disconnect(self) -> None:
         """
@@ -268,22 +437,45 @@ class Server(Node):
         if self.is_open():
 
             # For each connected client,...
-            for client in self.__clients:
+            for client in self._sockets:
 
                 # ... and closes the connection.
                 client.close()
 
+            # Aborts a hello() left blocked on accept in another thread.
+            try:
+                self._socket.shutdown(SHUT_RDWR)
+
+            # The socket may already be beyond shutting down.
+            except OSError:
+                pass
+
+            # Drops the persistent listener registration.
+            self._selector.close()
+
             # Closes the socket.
-            self.get_socket().close()
+            self._socket.close()
 
-        # Reset the client list.
-        self.__clients = None
+        # Reset the client arrays.
+        self._index = None
+        self._sockets = None
+        self._colors = None
+        self._names = None
+        self._modulations = None
+
+        # Reset the specialized fan-out.
+        self._broadcast_version = 0
+        self._compiled_broadcast = None
+        self._compiled_version = -1
 
         # Reset the events logs.
-        self.set_logs(None)
+        self._logs = None
+
+        # Reset the selector.
+        self._selector = None
 
         # Reset the socket.
-        self.set_socket(None)
+        self._socket = None
 
     def get_color(self, client: socket) -> str:
         """
@@ -304,11 +496,16 @@ class Server(Node):
         The client Formatter's color.
         """
 
-        # Checks whether the client is connected to this server.
-        self.check_client(client)
+        try:
+
+            # Return the Formatter color string assigned to the client.
+            # Looking the client up directly spares the membership check a
+            # call to check_client() would repeat.
+            return self._colors[self._index[client]]
 
-        # Return the Formatter color string assigned to the client.
-        return self.__clients[client]['color']
+        # An unknown client surfaces as a missing key.
+        except KeyError:
+            raise InvalidClientError(self._socket, client)
 
     def get_modulation(self, client: socket) -> str:
         """
@@ -329,11 +526,14 @@ class Server(Node):
         The client modulation type string.
         """
 
-        # Checks whether the client is connected to this server.
-        self.check_client(client)
+        try:
+
+            # Returns the modulation type string.
+            return self._modulations[self._index[client]]
 
-        # Returns the modulation type string.
-        return self.__clients[client]['modulation']
+        # An unknown client surfaces as a missing key.
+        except KeyError:
+            raise InvalidClientError(self._socket, client)
 
     def get_name(self, client: socket) -> str:
         """
@@ -354,11 +554,14 @@ class Server(Node):
         The client name.
         """
 
-        # Checks whether the client is connected to this server.
-        self.check_client(client)
+        try:
+
+            # Returns the name string.
+            return self._names[self._index[client]]
 
-        # Returns the name string.
-        return self.__clients[client]['name']
+        # An unknown client surfaces as a missing key.
+        except KeyError:
+            raise InvalidClientError(self._socket, client)
 
     def hello(self) -> socket:
         """
@@ -375,39 +578,88 @@ class Server(Node):
         # Checks whether the socket is already open.
         self.check_connection()
 
-        # While the socket is still open,...
-        while self.is_open():
+        try:
+
+            # Waits for a client attempting to connect. The registration
+            # is persistent, so every round costs a single poll on the
+            # selector already built by connect(). The finite timeout
+            # lets the loop notice a disconnect() performed by another
+            # thread.
+            while True:
+
+                # If nobody arrived within the timeout,...
+                if not self._selector.select(ATTEMPT_TIME):
 
-            # ... checks if there is some response from the socket.
-            response, _, _ = select([self.get_socket()], [], [], 0.1)
+                    # ... checks whether the server was shut down in the
+                    # meantime before waiting again.
+                    self.check_connection()
 
-            # While the socket is responding,...
-            if response:
+                    continue
 
-                # ... accepts a client that is attempting to connect.
-                client, _address = self.get_socket().accept()
+                try:
+
+                    # Accepts the connection attempt.
+                    client, _address = self._socket.accept()
+
+                # Another wake-up raced this one to the connection.
+                except BlockingIOError:
+                    continue
 
                 break
 
+        # The server was shut down while waiting.
+        except (AttributeError, OSError, ValueError):
+            raise SocketError()
+
+        # The accepted socket goes back to blocking mode, which the
+        # framed receive path relies on.
+        client.setblocking(True)
+
+        # Disables Nagle's algorithm on the brand new connection, so the
+        # short handshake strings and the audio frames leave right away.
+        client.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+
+        # Enlarges the kernel buffers past the default window ceiling.
+        client.setsockopt(SOL_SOCKET, SO_RCVBUF, BUFFER_SIZE)
+        client.setsockopt(SOL_SOCKET, SO_SNDBUF, BUFFER_SIZE)
+
+        # Keepalive probing detects a client that vanished without a FIN,
+        # so its handler thread fails in bounded time instead of hanging.
+        _keep_alive(client)
+
         # Selects the next color.
-        color = next(self.__client_colors)
+        color = next(self._client_colors)
+
+        # Receives his name.
+        name = self.recv_str(client)
 
-        # Creates a new client, setting his log accent color.
-        self.__clients[client] = {'color': color}
+        # Sends him back the defined color, already encoded.
+        self.send(client, _COLOR_BYTES[color])
 
-        # Receives and sets his name.
-        self.__clients[client]['name'] = self.recv_str(client)
+        # Receives his chosen modulation type.
+        modulation = self.recv_str(client)
 
-        # Sends him back the defined color.
-        self.send_str(client, color)
+        # Registers the brand new client across the parallel arrays,
+        # under the roster lock, atomically against a concurrent bye().
+        with self._lock:
+            self._index[client] = len(self._sockets)
+            self._sockets.append(client)
+            self._colors.append(color)
+            self._names.append(name)
+            self._modulations.append(modulation)
 
-        # Receives and sets his chosen modulation type.
-        self.__clients[client]['modulation'] = self.recv_str(client)
+            # The roster changed, so the specialized fan-out is stale.
+            self._broadcast_version += 1
 
         # Returns the client socket object.
         return client
 
-    def recv(self, client: socket) -> bytes:
+    # The trailing defaults bind the hot module-level names at definition
+    # time, turning their per-call LOAD_GLOBAL lookups into LOAD_FAST.
+    def recv(self,
+             client: socket,
+             _header: int = HEADER_SIZE,
+             _unpack=unpack) -> bytes:
         """
         Receives a package from a client.
 
@@ -426,8 +678,82 @@ class Server(Node):
         The received package.
         """
 
-        # Returns the received package.
-        return client.recv(PACKAGE_SIZE)
+        # Receives the package header, which carries the payload length.
+        header = self.__recv_exact(client, _header)
+
+        # If the connection was closed before a whole header arrived,...
+        if len(header) < _header:
+
+            # ... there is no package.
+            return b''
+
+        # Decodes the payload length.
+        (length, ) = _unpack('!I', header)
+
+        # Returns the received package payload.
+        return self.__recv_exact(client, length)
+
+    def recv_into(self, client: socket, buffer) -> int:
+        """
+        Receives a whole framed package from a client straight into a
+        caller provided buffer, which spares the per-package allocation
+        and copy that recv() performs. The caller preallocates the buffer
+        once and reuses it across calls.
+
+        ---
+        Arguments
+        ---
+
+            client (socket)
+        A client socket from which the package will be received.
+
+            buffer (bytearray, memoryview)
+        A writable buffer at least as large as the expected payload.
+
+        ---
+        Returns
+        ---
+
+            int
+        The payload length in bytes. Zero means the connection was closed
+        before a whole package arrived.
+        """
+
+        # Receives the package header, which carries the payload length.
+        header = self.__recv_exact(client, HEADER_SIZE)
+
+        # If the connection was closed before a whole header arrived,...
+        if len(header) < HEADER_SIZE:
+
+            # ... there is no package.
+            return 0
+
+        # Decodes the payload length.
+        (length, ) = unpack('!I', header)
+
+        # The destination window within the caller buffer.
+        view = memoryview(buffer)
+
+        # How much of the payload already arrived.
+        received = 0
+
+        # While the whole payload was not received,...
+        while received < length:
+
+            # ... receives the remainder directly into the buffer.
+            size = client.recv_into(view[received:length], length - received)
+
+            # If the connection was closed,...
+            if size == 0:
+
+                # ... stops receiving.
+                return 0
+
+            # Accounts the received bytes.
+            received += size
+
+        # Returns the payload length.
+        return length
 
     def recv_str(self, client: socket) -> str:
         """
@@ -448,13 +774,18 @@ class Server(Node):
         The received string.
         """
 
-        # Returns the received string.
-        return self.recv(client).decode(ENCODING)
+        # Returns the received string, decoded through the ASCII fast path
+        # when possible.
+        return _decode(self.recv(client))
 
+    # The trailing defaults bind the hot module-level names at definition
+    # time, turning their per-call LOAD_GLOBAL lookups into LOAD_FAST.
     def send(self,
              client: socket,
              package: bytes,
-             ensure: bool = True) -> Optional[int]:
+             ensure: bool = True,
+             _pack=pack,
+             _gather: bool = _HAS_SENDMSG) -> Optional[int]:
         """
         Sends a package to a client.
 
@@ -486,13 +817,34 @@ class Server(Node):
         Number of bytes sent, if ensure flag is True.
         """
 
-        # Checks whether the client is connected to this server.
-        self.check_client(client)
+        # The length prefix that frames the package. The per-package
+        # membership check is gone; a dead socket surfaces in the except
+        # below, and an unknown one behaves the same way.
+        header = _pack('!I', len(package))
 
         try:
 
-            # Sends the package to the client, with or without delivery guarantee.
-            return client.send(package) if ensure else client.sendall(package)
+            # Sends the framed package to the client with a single gathering
+            # syscall where the platform has one, with or without delivery
+            # guarantee.
+            if ensure and _gather:
+
+                # How long the whole frame is.
+                total = len(header) + len(package)
+
+                # The first attempt, gathering both pieces.
+                sent = client.sendmsg([header, package])
+
+                # `sendmsg` has `send` semantics: with the kernel buffer
+                # full it can write fewer bytes than asked, and a short
+                # write would desync the length-prefixed stream, so the
+                # tail is pushed until the frame is out whole.
+                if sent < total:
+                    client.sendall(memoryview(header + bytes(package))[sent:])
+
+                return total
+
+            return client.sendall(header + bytes(package))
 
         # If the client disconnected,...
         except (BrokenPipeError, ConnectionResetError, OSError):
@@ -500,10 +852,13 @@ class Server(Node):
             # ... raises an error.
             raise ClientDisconnectedError()
 
+    # The trailing default binds the bound codec at definition time,
+    # turning its per-call LOAD_GLOBAL lookup into LOAD_FAST.
     def send_str(self,
                  client: socket,
                  string: str,
-                 ensure: bool = True) -> Optional[int]:
+                 ensure: bool = True,
+                 _encode=utf_8_encode) -> Optional[int]:
         """
         Sends a string to a client.
 
@@ -528,9 +883,205 @@ class Server(Node):
         Number of bytes send, if ensure flag is True.
         """
 
-        # Checks whether the client is connected to this server.
-        self.check_client(client)
+        # Sends the string, encoded with the bound codec, to the client,
+        # with or without delivery guarantee.
+        return self.send(client, _encode(string)[0], ensure)
+
+    def __compile_broadcast(self) -> None:
+        """
+        Generates and compiles the first fan-out pass specialized for the
+        current roster: one unrolled send per connected client, with the
+        client and its send method bound as module-level names, so the
+        common round costs no iteration and no attribute lookups. The
+        pass only writes to the clients the caller found writable and
+        returns what is still owed, which the generic drain finishes, so
+        a backpressured client never blocks the others. The roster
+        version counter records which roster it was built for.
+        """
+
+        # Each client and its send method, bound under positional names.
+        bindings = {}
+
+        # The generated source, one guarded send per writable client.
+        lines = ['def _broadcast(frame, writable):',
+                 '    pending = {}']
+
+        # For each connected client,...
+        for position, client in enumerate(self._sockets):
+
+            # ... binds the socket and its send method...
+            bindings['_client%d' % position] = client
+            bindings['_send%d' % position] = client.send
+
+            # ... and unrolls a single non-blocking-sized send, deferring
+            # a busy client and any leftover bytes to the drain. A client
+            # gone dead is simply skipped.
+            lines.append('    if _client%d in writable:' % position)
+            lines.append('        try:')
+            lines.append('            sent = _send%d(frame)' % position)
+            lines.append('        except OSError:')
+            lines.append('            pass')
+            lines.append('        else:')
+            lines.append('            if sent < len(frame):')
+            lines.append('                pending[_client%d] = frame[sent:]'
+                         % position)
+            lines.append('    else:')
+            lines.append('        pending[_client%d] = frame' % position)
+
+        # Returns whatever is still owed.
+        lines.append('    return pending')
+
+        # The namespace the compiled function lands in.
+        namespace = {}
+
+        # Compiles the generated source with the bindings as its globals.
+        exec('\n'.join(lines), bindings, namespace)
+
+        # Installs the specialized fan-out and records its roster version.
+        self._compiled_broadcast = namespace['_broadcast']
+        self._compiled_version = self._broadcast_version
+
+    def __drain(self, pending: dict) -> None:
+        """
+        Finishes the delivery of what each client is still owed, writing
+        to each one as it becomes writable, so a single backpressured
+        client does not delay the others.
+
+        ---
+        Arguments
+        ---
+
+            pending (dict)
+        What remains to be sent, keyed by client socket.
+        """
+
+        # While some client still has bytes pending,...
+        while pending:
+
+            # ... waits until at least one of them is writable.
+            _, writable, _ = select([], list(pending), [])
+
+            # For each writable client,...
+            for client in writable:
+
+                # ... takes what it is still owed.
+                view = pending[client]
+
+                try:
+
+                    # Sends as much as the kernel accepts right away.
+                    sent = client.send(view)
+
+                # A disconnected client is simply left out.
+                except OSError:
+                    del pending[client]
+
+                    continue
+
+                # If everything was delivered,...
+                if sent == len(view):
+
+                    # ... this client is done.
+                    del pending[client]
+
+                # If no, keeps the rest for the next round.
+                else:
+                    pending[client] = view[sent:]
+
+    def __fan_out(self, frame: memoryview, black_list: frozenset) -> None:
+        """
+        Delivers an already framed buffer to every client not blacklisted,
+        writing to each one as it becomes writable, so a single
+        backpressured client does not delay the others.
+
+        ---
+        Arguments
+        ---
+
+            frame (memoryview)
+        The framed bytes to deliver, length prefixes included.
+
+            black_list (frozenset)
+        The clients which the frame should not be sent.
+        """
+
+        # With nothing to send to,...
+        if not self._sockets:
+
+            # ... there is nothing to do.
+            return
+
+        # With no blacklist the first pass is a static sweep over a
+        # stable roster, which the specialized function covers without
+        # building the full pending dict up front.
+        if not black_list:
+
+            # If the roster changed since the last compilation,...
+            if self._compiled_version != self._broadcast_version:
+
+                # ... rebuilds the specialized function.
+                self.__compile_broadcast()
+
+            # Checks which clients can take bytes right now, without
+            # waiting on any of them.
+            _, writable, _ = select([], self._sockets, [], 0)
+
+            # Delivers the frame through the unrolled sends; the clients
+            # not ready and the short writes come back as pending.
+            pending = self._compiled_broadcast(frame, set(writable))
+
+        # With a blacklist, every remaining client starts owed the
+        # whole frame.
+        else:
+            pending = {
+                client: frame
+                for client in self._sockets if client not in black_list
+            }
+
+        # Finishes the delivery as the clients become writable.
+        self.__drain(pending)
+
+    def __recv_exact(self, client: socket, size: int) -> bytes:
+        """
+        Receives exactly `size` bytes from a client. TCP is stream
+        oriented, so short reads are completed until the expected size.
+
+        ---
+        Arguments
+        ---
+
+            client (socket)
+        A client socket from which the bytes will be received.
+
+            size (int)
+        The exact number of bytes to receive.
+
+        ---
+        Returns
+        ---
+
+            bytes
+        The received bytes. Fewer than `size` are returned only when the
+        connection was closed.
+        """
+
+        # The received pieces.
+        data = bytearray()
+
+        # While the expected size was not reached,...
+        while len(data) < size:
+
+            # ... receives the remainder.
+            piece = client.recv(size - len(data))
+
+            # If the connection was closed,...
+            if not piece:
+
+                # ... stops receiving.
+                break
+
+            # Accumulates the received piece.
+            data += piece
 
-        # Sends the encoded string to the client, with or without delivery
-        # guarantee.
-        return self.send(client, string.encode(ENCODING), ensure)
+        # Returns the received bytes.
+        return bytes(data)
@@ -5,6 +5,9 @@ Default settings for socket connections.
 from modules.formatter.modules.colors import (BLUE, CYAN, GREEN, MAGENTA, RED,
                                               YELLOW)
 
+# Time for which a resolved server address stays cached, in seconds.
+ADDRESS_TTL = 60
+
 # Maximum time for a connection attempt by a client, in seconds.
 ATTEMPT_TIME = 3
 
@@ -12,8 +15,13 @@ ATTEMPT_TIME = 3
 # new connections.
 BACKLOG_SIZE = 10
 
-# Available client colors.
-COLORS = [RED, GREEN, YELLOW, BLUE, MAGENTA, CYAN]
+# Size requested for the kernel socket buffers, in bytes. In this case,
+# 256 KB, which keeps the audio stream from hitting the default window
+# ceiling on high latency links.
+BUFFER_SIZE = 1024 * 256
+
+# Available client colors, frozen as a tuple.
+COLORS = (RED, GREEN, YELLOW, BLUE, MAGENTA, CYAN)
 
 # Default hostname.
 DEFAULT_HOST = '127.0.0.1'
@@ -24,5 +32,24 @@ DEFAULT_PORT = 33000
 # String messages encoding.
 ENCODING = 'utf-8'
 
+# Size of the length prefix that frames every transmitted package, in bytes.
+HEADER_SIZE = 4
+
+# Number of unanswered keepalive probes after which a peer is declared dead.
+KEEPALIVE_COUNT = 3
+
+# Idle time before the kernel starts probing a silent peer, in seconds.
+KEEPALIVE_IDLE = 30
+
+# Interval between two keepalive probes, in seconds.
+KEEPALIVE_INTERVAL = 10
+
+# Maximum number of clients handled simultaneously by a server.
+MAX_CLIENTS = 10
+
 # Transmission package size. In this case, 4 KB.
 PACKAGE_SIZE = 1024 * 4
+
+# Number of packages the client receive buffer can hold. A single syscall
+# can then pull several packages at once when the kernel has them.
+RECV_BATCH = 8
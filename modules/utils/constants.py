@@ -8,6 +8,9 @@ DEFAULT_MARGIN_H = 2
 # Default chars number for right margins.
 DEFAULT_MARGIN_V = 1
 
+# Clears the whole screen and moves the cursor to its top left corner.
+CLEAR_SCREEN = '\033[2J\033[H'
+
 # Erases the line the cursor is currently on.
 ERASE_LINE = '\033[K'
 
@@ -1,22 +1,66 @@
-from datetime import datetime
+from collections import deque
+
+from functools import lru_cache
 
 from itertools import cycle
 
-from os import name, system
+from os import name, system, write
 
 from sys import stdin, stdout
 
-from threading import current_thread
+import sys
+
+from threading import Event
 
-from time import sleep
+from time import localtime, monotonic, strftime, time
 
-from typing import Optional
+from typing import List, Optional
 
 from modules.formatter.formatter import Formatter as F
 
-from modules.utils.constants import (DEFAULT_MARGIN_H as def_h,
+from modules.utils.constants import (CLEAR_SCREEN,
+                                     DEFAULT_MARGIN_H as def_h,
                                      DEFAULT_MARGIN_V as def_v, ERASE_LINE)
 
+# Whether stdout is attached to a terminal, detected once at import. When it
+# is not (piped or redirected), the redraw cosmetics are dropped instead of
+# wasting bandwidth on a log capture.
+try:
+    _TTY = stdout.isatty()
+except (AttributeError, ValueError):
+    _TTY = False
+
+# Whether the terminal understands the ANSI clear sequence, detected once at
+# import. POSIX terminals do; on Windows, modern consoles accept it after
+# the virtual terminal mode is switched on, and only the legacy ones keep
+# the subprocess fallback.
+if name != 'nt':
+    _ANSI_CLEAR = True
+else:
+    from os import environ
+
+    # Windows Terminal and ANSICON hosts already process the sequences.
+    _ANSI_CLEAR = bool(environ.get('WT_SESSION') or environ.get('ANSICON'))
+
+    # Elsewhere, tries to switch the console to virtual terminal mode.
+    if not _ANSI_CLEAR:
+        try:
+            from ctypes import byref, c_uint32, windll
+
+            # The console output handle and its current mode.
+            _handle = windll.kernel32.GetStdHandle(-11)
+            _mode = c_uint32()
+
+            # Turns ENABLE_VIRTUAL_TERMINAL_PROCESSING (0x0004) on.
+            if windll.kernel32.GetConsoleMode(_handle, byref(_mode)):
+                _ANSI_CLEAR = bool(
+                    windll.kernel32.SetConsoleMode(_handle,
+                                                   _mode.value | 0x0004))
+
+        # The console does not support it.
+        except (ImportError, OSError):
+            pass
+
 
 def _l(string: str = '', left: int = def_h) -> str:
     """
@@ -40,8 +84,9 @@ def _l(string: str = '', left: int = def_h) -> str:
     The string with the margin.
     """
 
-    # Returns the formatted string.
-    return _lt(string, left, 0)
+    # Returns the formatted string, built by plain concatenation, with no
+    # delegation down the helper chain.
+    return ' ' * abs(int(left)) + str(string)
 
 
 def _ltb(string: str = '',
@@ -76,16 +121,10 @@ def _ltb(string: str = '',
     The string with the margins.
     """
 
-    # Sets the margins.
-    left = abs(int(left)) + len(str(string))
-    top = '\n' * abs(int(top))
-    bottom = '\n' * abs(int(bottom))
-
-    # Returns the formatted string.
-    return '{top}{:>{left}}{bottom}'.format(str(string),
-                                            left=left,
-                                            top=top,
-                                            bottom=bottom)
+    # Returns the formatted string, built by plain concatenation, which
+    # skips str.format and its width computation branch.
+    return ('\n' * abs(int(top)) + ' ' * abs(int(left)) + str(string) +
+            '\n' * abs(int(bottom)))
 
 
 def _lt(string: str = '', left: int = def_h, top: int = def_v) -> str:
@@ -114,8 +153,57 @@ def _lt(string: str = '', left: int = def_h, top: int = def_v) -> str:
     The string with the margins.
     """
 
-    # Returns the formatted string.
-    return _ltb(string, left, top, 0)
+    # Returns the formatted string, built by plain concatenation, with no
+    # delegation down the helper chain.
+    return '\n' * abs(int(top)) + ' ' * abs(int(left)) + str(string)
+
+
+# Typography generated at:
+# http://patorjk.com/software/taag/#p=display&f=ANSI%20Shadow&t=PyRadio
+#
+# There was an elongation of a line in the capital letters, only.
+_TITLE_LINES = (
+    '██████╗          ██████╗',
+    '██╔══██╗██╗   ██╗██╔══██╗ █████╗ ██████╗ ██╗ ██████╗',
+    '██████╔╝╚██╗ ██╔╝██████╔╝██╔══██╗██╔══██╗██║██╔═══██╗',
+    '██╔═══╝  ╚████╔╝ ██╔══██╗███████║██║  ██║██║██║   ██║',
+    '██║       ╚██╔╝  ██║  ██║██╔══██║██║  ██║██║██║   ██║',
+    '██║        ██║   ██║  ██║██║  ██║██████╔╝██║╚██████╔╝',
+    '╚═╝        ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═╝╚═════╝ ╚═╝ ╚═════╝',
+)
+
+
+@lru_cache(maxsize=8)
+def _title_str(margin: int = def_h) -> str:
+    """
+    Assembles the PyRadio title banner, cached per margin, since the
+    banner never changes between redraws.
+
+    ---
+    Arguments
+    ---
+
+        margin (int, def_h)
+    A number of chars for the margin, based on the left margin.
+
+    ---
+    Returns
+    ---
+
+        str
+    The formatted title.
+    """
+
+    # It does not accept negative or odd margins.
+    margin_h = abs(int(margin)) - int(margin) % 2
+
+    # Vertical margins are half of the left margin.
+    margin_v = margin_h / 2
+
+    # Returns the formatted joining of the title lines with a breakline
+    # and the margin as a plain separator, with no format spec to parse.
+    return _ltb(('\n' + ' ' * margin_h).join(_TITLE_LINES), margin_h,
+                margin_v, margin_v)
 
 
 def chevron(marker: str = '>',
@@ -160,10 +248,28 @@ def clear() -> None:
     Clean the terminal screen.
     """
 
+    # With no terminal attached there is no screen to wipe.
+    if not _TTY:
+        return
+
     try:
 
-        # Runs the command corresponding to the current operating system.
-        system('cls' if name == 'nt' else 'clear')
+        # Where the terminal understands it,...
+        if _ANSI_CLEAR:
+
+            # ... a single escape write wipes the screen, which spares the
+            # fork and the shell startup of a subprocess per redraw.
+            sys.stdout.write(CLEAR_SCREEN)
+            sys.stdout.flush()
+
+            return
+
+        # Delivers anything still sitting in a buffered stdout, so the
+        # pending output is not wiped out of order.
+        sys.stdout.flush()
+
+        # Falls back to the command of a legacy Windows console.
+        system('cls')
 
     # Ctrl+C pressed.
     except (EOFError, KeyboardInterrupt):
@@ -173,7 +279,8 @@ def clear() -> None:
 def ellipsis(string: str = '',
              formatter: F = None,
              max_points: int = 3,
-             freq: float = 2.0) -> None:
+             freq: float = 2.0,
+             stop: Event = None) -> None:
     """
     Shows a ellipsis feedback animation while a process is running.
 
@@ -192,13 +299,23 @@ def ellipsis(string: str = '',
 
         freq (float, 2.0)
     Frequency of the animation cycle.
+
+        stop (Event, None)
+    An event that terminates the animation when set.
     """
 
-    # Gets the current thread.
-    thread = current_thread()
+    # If a stop event was not provided,...
+    if stop is None:
+
+        # ... creates one, although nobody will ever set it.
+        stop = Event()
+
+    # With no terminal attached the `\r` redraws are pure noise in the
+    # output, so the animation just sits on the stop event instead.
+    if not _TTY:
+        stop.wait()
 
-    # The threads start alive.
-    thread.alive = True
+        return
 
     # If a Formatter was not provided,...
     if formatter is None:
@@ -206,27 +323,67 @@ def ellipsis(string: str = '',
         # ... instantiates a new one.
         formatter = F()
 
-    # Lists the animation pieces.
-    chars = ['.' * i for i in range(1, max_points + 1)]
+    # The frames, fully rendered and encoded up front, so each tick costs
+    # a single write and a wait instead of a Formatter chain.
+    frames = [('\r' + formatter.erase(string + '.' * i).render() +
+               ERASE_LINE).encode() for i in range(1, max_points + 1)]
 
-    # The animation cycles through the elements of the pieces list.
-    for char in cycle(chars):
+    # The raw descriptor behind stdout. Writing the frames straight to it
+    # skips the TextIOWrapper encode, lock and flush cycle per frame.
+    fd = stdout.fileno()
 
-        # If the thread has stopped,...
-        if not thread.alive:
+    # The animation period and the absolute deadline of the next tick.
+    # Pacing against the monotonic clock keeps the write and flush time
+    # from accumulating into drift.
+    period = 1.0 / freq
+    deadline = monotonic() + period
 
-            # ... then stops the animation.
+    # How much the timed wait overslept lately, and the slack the next
+    # wait aims short by, so a brief spin can land the exact deadline
+    # even where the OS timer granularity is coarse.
+    errors = deque(maxlen=8)
+    slack = 0.0
+
+    # The animation cycles through the prerendered frames.
+    for frame in cycle(frames):
+
+        # If the animation was stopped,...
+        if stop.is_set():
+
+            # ... does not waste a final frame.
             break
 
-        # Prints the string followed by the current piece.
-        stdout.write('\r' + formatter.erase(string + char).render() +
-                     ERASE_LINE)
-        stdout.flush()
+        # Delivers the frame with a single unbuffered write.
+        write(fd, frame)
+
+        # Waits most of the interval in the kernel, aiming short by the
+        # measured oversleep. A caller setting the event mid-wait ends
+        # the animation right away.
+        delay = deadline - monotonic() - slack
+
+        if delay > 0:
 
-        # Pauses for a period.
-        sleep(1 / freq)
+            if stop.wait(delay):
+                break
 
+            # Accounts how much this wait overshot its target and keeps
+            # the slack at the worst of the recent ones.
+            errors.append(monotonic() - (deadline - slack))
+            slack = max(0.0, max(errors))
 
+        # Spins out the residual until the exact deadline, still
+        # honoring a stop.
+        while monotonic() < deadline and not stop.is_set():
+            pass
+
+        # Schedules the next tick from the previous deadline, not from
+        # the wake-up time.
+        deadline += period
+
+
+# The same few messages come back on every retry, so the built
+# Formatter is cached per string.
+@lru_cache(maxsize=64)
 def error(string: str) -> F:
     """
     Shows a formatted error message.
@@ -250,31 +407,46 @@ def error(string: str) -> F:
     return F().bold().red(string)
 
 
-def flush_input() -> None:
-    """
-    Flushes the input buffer.
+# The platform implementation is bound once at import, which spares the
+# import attempt and its ImportError on every keyboard flush.
+try:
 
-    Taken from:
-    https://rosettacode.org/wiki/Keyboard_input/Flush_the_keyboard_buffer#Python
-    """
+    # The module for Windows.
+    import msvcrt
 
-    try:
+    def flush_input() -> None:
+        """
+        Flushes the input buffer.
 
-        # Tries to flush with the module for Windows.
-        import msvcrt
+        Taken from:
+        https://rosettacode.org/wiki/Keyboard_input/Flush_the_keyboard_buffer#Python
+        """
 
+        # Drains the pending keystrokes.
         while msvcrt.kbhit():
             msvcrt.getch()
 
-    # If it is unable to import,...
-    except ImportError:
+# If it is unable to import,...
+except ImportError:
 
-        # ... tries the module for Linux.
-        import termios
+    # ... uses the module for Linux.
+    import termios
 
+    def flush_input() -> None:
+        """
+        Flushes the input buffer.
+
+        Taken from:
+        https://rosettacode.org/wiki/Keyboard_input/Flush_the_keyboard_buffer#Python
+        """
+
+        # Discards both the input and the output queues.
         termios.tcflush(stdin, termios.TCIOFLUSH)
 
 
+# The same few messages come back on every retry, so the built
+# Formatter is cached per string.
+@lru_cache(maxsize=64)
 def info(string: str) -> F:
     """
     Shows a formatted information message.
@@ -342,6 +514,68 @@ def label(string: str,
         string)
 
 
+# Rendered menu option blocks, cached since the labels never change
+# between redraws.
+_menu_cache = {}
+
+
+def menu(labels: List[str], exit_label: str = None) -> str:
+    """
+    Renders a numbered menu option list as a single string. The rendered
+    block is cached, so redraws of the same menu cost one dict lookup and
+    one print instead of one Formatter chain per option.
+
+    ---
+    Arguments
+    ---
+
+        labels (List(str))
+    The option labels, in order. Options are numbered from 1.
+
+        exit_label (str, None)
+    A label for the option of number 0, if any.
+
+    ---
+    Returns
+    ---
+
+        str
+    The rendered option list.
+    """
+
+    # The cache key covers everything the rendering depends on.
+    key = (tuple(labels), exit_label)
+
+    # Fetches the block from the cache.
+    rendered = _menu_cache.get(key)
+
+    # If it was not rendered yet,...
+    if rendered is None:
+
+        # ... renders each option line...
+        lines = [
+            _l(label(string, F().red(i + 1), F()))
+            for i, string in enumerate(labels)
+        ]
+
+        # ... and the exit option, when provided.
+        if exit_label is not None:
+            lines.append(_l(label(exit_label, F().red(0), F())))
+
+        # Joins the lines in a single block and caches it.
+        rendered = '\n'.join(lines)
+        _menu_cache[key] = rendered
+
+    # Returns the rendered block.
+    return rendered
+
+
+# The last formatted timestamp and the integer second it belongs to. The
+# string is invariant within a second, and labels often come in bursts.
+_now_sec = -1
+_now_str = ''
+
+
 def now() -> str:
     """
     Gets the current date and time.
@@ -354,8 +588,20 @@ def now() -> str:
     The formatted date and time.
     """
 
-    # Returnas the formatted date and time.
-    return datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+    global _now_sec, _now_str
+
+    # The current integer second.
+    sec = int(time())
+
+    # If the cached timestamp is from another second,...
+    if sec != _now_sec:
+
+        # ... formats and caches the current one.
+        _now_str = strftime('%d/%m/%Y %H:%M:%S', localtime(sec))
+        _now_sec = sec
+
+    # Returns the formatted date and time.
+    return _now_str
 
 
 def press_enter_to(action: str,
@@ -422,6 +668,10 @@ def press_enter_to(action: str,
         # Flushes some previous inputs.
         flush_input()
 
+        # Delivers anything still sitting in a buffered stdout before
+        # blocking on the prompt.
+        sys.stdout.flush()
+
         # Waits for the user to press the ENTER key.
         input(output)
 
@@ -430,6 +680,9 @@ def press_enter_to(action: str,
         pass
 
 
+# The same few messages come back on every retry, so the built
+# Formatter is cached per string.
+@lru_cache(maxsize=64)
 def success(string: str) -> F:
     """
     Shows a formatted success message.
@@ -475,37 +728,19 @@ def title(margin: int = def_h, clear_screen: bool = True) -> str:
     The formatted title.
     """
 
-    # It does not accept negative or odd margins.
-    margin_h = abs(int(margin)) - int(margin) % 2
-
-    # Vertical margins are half of the left margin.
-    margin_v = margin_h / 2
-
-    # Typography generated at:
-    # http://patorjk.com/software/taag/#p=display&f=ANSI%20Shadow&t=PyRadio
-    #
-    # There was an elongation of a line in the capital letters, only.
-    lines = [
-        '██████╗          ██████╗',
-        '██╔══██╗██╗   ██╗██╔══██╗ █████╗ ██████╗ ██╗ ██████╗',
-        '██████╔╝╚██╗ ██╔╝██████╔╝██╔══██╗██╔══██╗██║██╔═══██╗',
-        '██╔═══╝  ╚████╔╝ ██╔══██╗███████║██║  ██║██║██║   ██║',
-        '██║       ╚██╔╝  ██║  ██║██╔══██║██║  ██║██║██║   ██║',
-        '██║        ██║   ██║  ██║██║  ██║██████╔╝██║╚██████╔╝',
-        '╚═╝        ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═╝╚═════╝ ╚═╝ ╚═════╝'
-    ]
-
     # If the [clear_screen] flag is True,...
     if clear_screen:
 
         # ... clean the terminal screen before printing.
         clear()
 
-    # Returns the formatted joining of the lines list with a breakline.
-    return _ltb('{:{margin}}'.format('\n', margin=margin_h + 1).join(lines),
-                margin_h, margin_v, margin_v)
+    # Returns the banner, assembled once per margin and cached.
+    return _title_str(margin)
 
 
+# The same few messages come back on every retry, so the built
+# Formatter is cached per string.
+@lru_cache(maxsize=64)
 def warning(string: str) -> F:
     """
     Shows a formatted warning message.
@@ -1,77 +1,112 @@
 from emoji import emojize
 
+import sys
+
 from modules.formatter.formatter import Formatter as F
 
 from modules.core.menu import client_option, server_option
 
-from modules.utils.utils import (_l, _lt, _ltb, clear, error, label,
+from modules.utils.utils import (_l, _lt, _ltb, clear, error, menu,
                                  press_enter_to, title)
 
-try:
-    while True:
-        print(F().blue(title()))
+# The main menu option handlers, dispatched straight by number, which spares
+# the string-keyed globals() scan. Zero exits.
+DISPATCH = {1: server_option, 2: client_option}
+
+# The option block never changes, so it is rendered once at import.
+OPTIONS_BLOCK = menu(['Server', 'Client'], 'Exit PyRadio')
+
+# The farewell emojis are literal constants, so the alias-table scan that
+# emojize() performs runs once at import instead of on the exit path.
+COFFEE = emojize(':hot_beverage:')
+HEART = emojize(':yellow_heart:')
+
+
+def main() -> None:
+    """
+    Runs the main menu loop until the user exits. Living inside a function,
+    the loop variables are fast locals instead of module-global lookups.
+    """
+
+    try:
+        while True:
+
+            # Builds the whole menu screen as a single string and delivers
+            # it with one write, instead of one per line.
+            sys.stdout.write('\n'.join([
+                str(F().blue(title())),
+                _l(F().bold().blue('Welcome to PyRadio!')),
+                _ltb('What will be the mode of this instance?'),
+                OPTIONS_BLOCK,
+            ]) + '\n')
 
-        # Initial messages.
-        print(_l(F().bold().blue('Welcome to PyRadio!')))
-        print(_ltb('What will be the mode of this instance?'))
+            # Reads the chosen option, delivering the buffered screen first.
+            try:
+                sys.stdout.flush()
 
-        # Defines the main menu options, with their respective methods.
-        options = [['Server', 'server_option'], ['Client', 'client_option']]
+                opt = int(input(_lt('Your option: ')))
 
-        # Lists the options.
-        for i, option in enumerate(options):
-            print(_l(label(option[0], F().red(i + 1), F())))
+                # Checks whether the option is available.
+                if opt and opt not in DISPATCH:
+                    raise ValueError()
 
-        print(_l(label('Exit PyRadio', F().red(0), F())))
+            # Invalid or nonexistent option.
+            except ValueError:
+                print(_lt(error('Invalid option!')))
+                press_enter_to('try again', F().red(), F().white())
 
-        # Reads the chosen option.
-        try:
-            opt = int(input(_lt('Your option: ')))
+                continue
 
-            # Checks whether the option is available.
-            if opt not in range(0, len(options) + 1):
-                raise ValueError()
+            # If the option is 0, exit.
+            if not opt:
+                break
 
-        # Invalid or nonexistent option.
-        except ValueError:
-            print(_lt(error('Invalid option!')))
-            press_enter_to('try again', F().red(), F().white())
+            # If no, runs the corresponding function.
+            DISPATCH[opt]()
 
-            continue
+    # Ctrl+C pressed.
+    except (EOFError, KeyboardInterrupt):
+        pass
 
-        # If the option is 0, exit.
-        if not opt:
-            break
 
-        # If no, runs the corresponding function.
-        globals()[options[opt - 1][1]]()
+def shutdown() -> None:
+    """
+    Shows the farewell screen and cleans up the terminal.
+    """
 
-# Ctrl+C pressed.
-except (EOFError, KeyboardInterrupt):
-    pass
+    try:
 
-try:
-    print(F().blue(title()))
+        # Builds the farewell screen, with the acknowledgments, the credits
+        # and other stuffs, and delivers it with one write.
+        sys.stdout.write('\n'.join([
+            str(F().blue(title())),
+            _l(F().bold().blue('Thank you very much for using PyRadio!')),
+            _lt(F().blue('Credits:')),
+            _lt('2020 © Marlon Luís de Col'),
+            _l('Computer Engineering'),
+            _l('Unoesc Chapecó'),
+            _lt(F().blue(
+                'Made with {} and {} in Brazil!'.format(COFFEE, HEART))),
+        ]) + '\n')
 
-    # Acknowledgments and finishing the application.
-    print(_l(F().bold().blue('Thank you very much for using PyRadio!')))
+        press_enter_to('finish', F().blue(), F().white())
 
-    # Credits, about and other stuffs.
-    print(_lt(F().blue('Credits:')))
+        print()
+        clear()
 
-    print(_lt('2020 © Marlon Luís de Col'))
-    print(_l('Computer Engineering'))
-    print(_l('Unoesc Chapecó'))
+    # Ctrl+C pressed.
+    except (EOFError, KeyboardInterrupt):
+        pass
 
-    print(
-        _lt(F().blue('Made with {} and {} in Brazil!'.format(
-            emojize(':hot_beverage:'), emojize(':yellow_heart:')))))
 
-    press_enter_to('finish', F().blue(), F().white())
+if __name__ == '__main__':
 
-    print()
-    clear()
+    # Each menu render issues a dozen small prints, and the line buffered
+    # stdout turns each one into its own write syscall. Turning the line
+    # buffering off lets the existing block buffer coalesce a whole screen
+    # into one or two writes; the input synchronization points flush it
+    # before reading.
+    sys.stdout.reconfigure(line_buffering=False)
 
-# Ctrl+C pressed.
-except (EOFError, KeyboardInterrupt):
-    pass
+    main()
+    shutdown()